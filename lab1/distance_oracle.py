@@ -0,0 +1,96 @@
+"""
+Precomputed distance-to-goal tables for puzzles whose whole state space fits in memory.
+
+The oracle is built once by a breadth-first search backwards from every goal
+state, using the puzzle's get_predecessors callback (get_successors for puzzles
+whose moves can be undone). States must be packed into non-negative integers.
+The tables are three parallel arrays sorted by state code:
+
+    states[i]     packed state
+    distance[i]   number of moves from states[i] to the nearest goal
+    next_index[i] index of the state one move closer to a goal (-1 for goals)
+
+Afterwards any query is a binary search for the start state followed by a
+walk along next_index, with no search at all. An oracle only answers queries
+towards the goals it was built for, not between arbitrary pairs of states:
+a different goal needs an oracle of its own.
+"""
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+_MAGIC = b"DORC"
+_HEADER = struct.Struct("<4sQ")
+
+class DistanceOracle:
+    def __init__(self, states, distance, next_index):
+        self.states = states
+        self.distance = distance
+        self.next_index = next_index
+
+    @classmethod
+    def build(cls, goals, get_predecessors):
+        """Enumerates every state that can reach one of 'goals' and records its distance and next move."""
+        next_state = {goal: None for goal in goals}
+        distance = {goal: 0 for goal in goals}
+        frontier = deque(goals)
+        while frontier:
+            current = frontier.popleft()
+            for predecessor in get_predecessors(current):
+                if predecessor not in distance:
+                    distance[predecessor] = distance[current] + 1
+                    next_state[predecessor] = current
+                    frontier.append(predecessor)
+
+        states = array("q", sorted(distance))
+        index_of = {state: i for i, state in enumerate(states)}
+        return cls(
+            states,
+            array("i", (distance[state] for state in states)),
+            array("i", (-1 if next_state[state] is None else index_of[next_state[state]] for state in states)),
+        )
+
+    def __len__(self):
+        return len(self.states)
+
+    def _index(self, state):
+        i = bisect_left(self.states, state)
+        if i < len(self.states) and self.states[i] == state:
+            return i
+        return None
+
+    def distance_to_goal(self, state):
+        """Number of moves from 'state' to the nearest goal, or None if no goal is reachable."""
+        i = self._index(state)
+        return None if i is None else self.distance[i]
+
+    def path_to_goal(self, state):
+        """A shortest path from 'state' to a goal, or None if no goal is reachable."""
+        i = self._index(state)
+        if i is None:
+            return None
+        path = [self.states[i]]
+        while self.next_index[i] != -1:
+            i = self.next_index[i]
+            path.append(self.states[i])
+        return path
+
+    def save(self, file_path):
+        with open(file_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(self.states)))
+            self.states.tofile(file)
+            self.distance.tofile(file)
+            self.next_index.tofile(file)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as file:
+            magic, count = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"'{file_path}' is not a distance oracle file")
+            states, distance, next_index = array("q"), array("i"), array("i")
+            states.fromfile(file, count)
+            distance.fromfile(file, count)
+            next_index.fromfile(file, count)
+        return cls(states, distance, next_index)
@@ -1,78 +1,161 @@
-from collections import deque
+import os
+import sys
+import tempfile
+from time import time
 
-def is_valid_state(state):
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from search_kernel import STRATEGIES, run_search
+from distance_oracle import DistanceOracle
+
+# Classic instance: 3 missionaries, 3 cannibals and a boat that holds 2.
+NUM_PEOPLE = 3
+BOAT_CAPACITY = 2
+
+def encode_state(state, n=NUM_PEOPLE):
+    """Packs a (m_left, c_left, boat_pos) tuple into a single integer."""
+    m_left, c_left, boat_pos = state
+    return (m_left * (n + 1) + c_left) * 2 + boat_pos
+
+def decode_state(code, n=NUM_PEOPLE):
+    """Unpacks an integer produced by encode_state back into a tuple."""
+    rest, boat_pos = divmod(code, 2)
+    m_left, c_left = divmod(rest, n + 1)
+    return m_left, c_left, boat_pos
+
+def boat_loads(k=BOAT_CAPACITY):
+    """All (missionaries, cannibals) combinations that fit in a boat of capacity k."""
+    return [(m, c) for m in range(k + 1) for c in range(k + 1 - m) if m + c > 0]
+
+def is_valid_state(state, n=NUM_PEOPLE):
     """Checks if a state is valid according to the rules."""
     m_left, c_left, boat_pos = state
-    
-    # Check for invalid numbers of people (less than 0 or more than 3)
-    if not (0 <= m_left <= 3 and 0 <= c_left <= 3):
+
+    # Check for invalid numbers of people (less than 0 or more than n)
+    if not (0 <= m_left <= n and 0 <= c_left <= n):
         return False
-        
-    m_right = 3 - m_left
-    c_right = 3 - c_left
-    
+
+    m_right = n - m_left
+    c_right = n - c_left
+
     # Check if cannibals outnumber missionaries on the left bank
     if m_left > 0 and m_left < c_left:
         return False
-        
+
     # Check if cannibals outnumber missionaries on the right bank
     if m_right > 0 and m_right < c_right:
         return False
-        
+
     return True
 
-def get_successors(current_state):
+def get_successors(current_state, n=NUM_PEOPLE, k=BOAT_CAPACITY):
     """Generates all valid successor states from the current state."""
     successors = []
     m_left, c_left, boat_pos = current_state
-    
+
     # Possible moves are (missionaries_to_move, cannibals_to_move)
-    possible_moves = [(1, 0), (2, 0), (0, 1), (0, 2), (1, 1)]
-    
-    for m_move, c_move in possible_moves:
+    for m_move, c_move in boat_loads(k):
         if boat_pos == 1:  # Boat is on the left, moves to the right
             next_state = (m_left - m_move, c_left - c_move, 0)
         else:  # Boat is on the right, moves to the left
             next_state = (m_left + m_move, c_left + c_move, 1)
-            
-        if is_valid_state(next_state):
+
+        if is_valid_state(next_state, n):
             successors.append(next_state)
-            
+
     return successors
 
-def breadth_first_search(initial_state, goal_state):
+def get_packed_successors(code, n, loads):
+    """
+    Same as get_successors but works on packed integer states.
+    'loads' is the precomputed output of boat_loads(k).
+    """
+    m_left, c_left, boat_pos = decode_state(code, n)
+    sign = -1 if boat_pos == 1 else 1
+    successors = []
+    for m_move, c_move in loads:
+        next_state = (m_left + sign * m_move, c_left + sign * c_move, 1 - boat_pos)
+        if is_valid_state(next_state, n):
+            successors.append(encode_state(next_state, n))
+    return successors
+
+def solve(initial_state, goal_state, n=NUM_PEOPLE, k=BOAT_CAPACITY, strategy="bfs"):
+    """
+    Runs one of the shared search_kernel strategies on packed states.
+    Every crossing can be undone by the opposite crossing, so the bidirectional
+    search can use the same successor function in both directions.
+    Returns (path, stats) with the path decoded back into tuples.
+    """
+    loads = boat_loads(k)
+    path, stats = run_search(
+        strategy,
+        encode_state(initial_state, n),
+        encode_state(goal_state, n),
+        lambda code: get_packed_successors(code, n, loads),
+    )
+    if path is not None:
+        path = [decode_state(code, n) for code in path]
+    return path, stats
+
+def breadth_first_search(initial_state, goal_state, n=NUM_PEOPLE, k=BOAT_CAPACITY):
     """Performs a breadth-first search to find the shortest path."""
-    # The frontier holds states to be explored. For BFS, it's a queue.
-    frontier = deque([(initial_state, [])]) 
-    explored = set()
-    
-    while frontier:
-        current_state, path = frontier.popleft()
-        
-        if current_state in explored:
-            continue
-            
-        explored.add(current_state)
-        new_path = path + [current_state]
-        
-        if current_state == goal_state:
-            return new_path  # Solution found
-            
-        for successor_state in get_successors(current_state):
-            if successor_state not in explored:
-                frontier.append((successor_state, new_path))
-                
-    return None # No solution found
+    return solve(initial_state, goal_state, n, k, "bfs")[0]
+
+def bidirectional_search(initial_state, goal_state, n=NUM_PEOPLE, k=BOAT_CAPACITY):
+    """Searches from both ends at once; returns a shortest path like breadth_first_search."""
+    return solve(initial_state, goal_state, n, k, "bidirectional")[0]
+
+def build_oracle(goal_state=(0, 0, 0), n=NUM_PEOPLE, k=BOAT_CAPACITY):
+    """
+    Precomputes the distance from every state to 'goal_state'. Crossings are
+    reversible, so the backward search uses the ordinary successor function.
+    """
+    loads = boat_loads(k)
+    return DistanceOracle.build([encode_state(goal_state, n)], lambda code: get_packed_successors(code, n, loads))
+
+def oracle_path(oracle, initial_state, n=NUM_PEOPLE):
+    """Answers a query from a prebuilt oracle by walking its next-move table."""
+    path = oracle.path_to_goal(encode_state(initial_state, n))
+    return None if path is None else [decode_state(code, n) for code in path]
+
+def print_solution(solution_path):
+    if solution_path:
+        print("Solution found:")
+        for i, state_in_path in enumerate(solution_path):
+            print(f"Step {i}: {state_in_path}")
+    else:
+        print("No solution found.")
 
 # --- Main Execution ---
-initial_state = (3, 3, 1)
-goal_state = (0, 0, 0)
+if __name__ == "__main__":
+    initial_state = (NUM_PEOPLE, NUM_PEOPLE, 1)
+    goal_state = (0, 0, 0)
+
+    print_solution(breadth_first_search(initial_state, goal_state))
+
+    print("\nStrategy comparison on the classic instance:")
+    for strategy in STRATEGIES:
+        print(solve(initial_state, goal_state, strategy=strategy)[1])
+
+    # Larger instances: (people per side, boat capacity). A boat of 4 can ferry any N.
+    print("\nGeneralized instances (bidirectional BFS):")
+    for n, k in [(5, 3), (100, 4), (1000, 4)]:
+        print(f"N={n:<6} K={k:<3}", solve((n, n, 1), (0, 0, 0), n, k, "bidirectional")[1])
+
+    # Precompute once, then answer queries by table walks instead of searches.
+    oracle_file = os.path.join(tempfile.gettempdir(), f"missionaries_cannibals_n{NUM_PEOPLE}_k{BOAT_CAPACITY}.oracle")
+    build_oracle().save(oracle_file)
+    oracle = DistanceOracle.load(oracle_file)
+    queries = [decode_state(code) for code in oracle.states] * 100
+
+    start_time = time()
+    for state in queries:
+        breadth_first_search(state, goal_state)
+    search_time = time() - start_time
 
-solution_path = breadth_first_search(initial_state, goal_state)
+    start_time = time()
+    for state in queries:
+        oracle_path(oracle, state)
+    oracle_time = time() - start_time
 
-if solution_path:
-    print("Solution found:")
-    for i, state_in_path in enumerate(solution_path):
-        print(f"Step {i}: {state_in_path}")
-else:
-    print("No solution found.")
\ No newline at end of file
+    print(f"\nDistance oracle: {len(oracle)} solvable states saved to {oracle_file}")
+    print(f"{len(queries)} queries: BFS {len(queries) / search_time:.0f} q/s, oracle {len(queries) / oracle_time:.0f} q/s")
@@ -0,0 +1,183 @@
+"""
+Uninformed search strategies shared by the lab1 puzzles.
+
+A puzzle plugs in through a get_successors(state) callback returning the
+states reachable in one move, plus either a goal state or an is_goal(state)
+predicate. States only need to be hashable. Every search returns a
+(path, stats) tuple where path is the list of states from start to goal
+(None if no solution exists) and stats is a SearchStats instance.
+"""
+from collections import deque
+from time import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None if unavailable."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+class SearchStats:
+    """Counters collected while a search runs."""
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.expansions = 0       # States whose successors were generated
+        self.peak_frontier = 0    # Largest number of states waiting to be expanded
+        self.elapsed = 0.0        # Wall time in seconds
+        self.peak_rss_kb = None   # Peak RSS of the process after the search
+        self.solution_length = None
+
+    @property
+    def nodes_per_sec(self):
+        return self.expansions / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        rss = f"{self.peak_rss_kb} KB" if self.peak_rss_kb is not None else "n/a"
+        return (f"{self.strategy}: moves={self.solution_length}, expansions={self.expansions}, "
+                f"nodes/sec={self.nodes_per_sec:.0f}, peak frontier={self.peak_frontier}, "
+                f"peak RSS={rss}, time={self.elapsed:.4f}s")
+
+def _finish(stats, start_time, path):
+    stats.elapsed = time() - start_time
+    stats.peak_rss_kb = peak_rss_kb()
+    if path is not None:
+        stats.solution_length = len(path) - 1
+    return path, stats
+
+def _walk_parents(parents, state):
+    """Follows parent pointers from 'state' back to the root (whose parent is None)."""
+    chain = []
+    while state is not None:
+        chain.append(state)
+        state = parents[state]
+    return chain
+
+def breadth_first_search(start, is_goal, get_successors):
+    """
+    Breadth-first search. Each discovered state stores only its parent, so the
+    frontier holds bare states instead of a path copy per entry.
+    """
+    stats = SearchStats("bfs")
+    start_time = time()
+    parents = {start: None}
+    frontier = deque([start])
+
+    while frontier:
+        stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+        current = frontier.popleft()
+
+        if is_goal(current):
+            return _finish(stats, start_time, _walk_parents(parents, current)[::-1])
+
+        stats.expansions += 1
+        for successor in get_successors(current):
+            if successor not in parents:
+                parents[successor] = current
+                frontier.append(successor)
+
+    return _finish(stats, start_time, None)
+
+def iterative_deepening_search(start, is_goal, get_successors, max_depth=1000):
+    """
+    Depth-first search with an increasing depth limit. Memory is O(depth):
+    only the current path and one iterator per level are kept, and states
+    already on the path are skipped to avoid cycles.
+    """
+    stats = SearchStats("iddfs")
+    start_time = time()
+
+    if is_goal(start):
+        return _finish(stats, start_time, [start])
+
+    for limit in range(1, max_depth + 1):
+        path = [start]
+        on_path = {start}
+        stack = [iter(get_successors(start))]
+        stats.expansions += 1
+        cutoff = False
+
+        while stack:
+            stats.peak_frontier = max(stats.peak_frontier, len(stack))
+            successor = next(stack[-1], None)
+            if successor is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if successor in on_path:
+                continue
+            path.append(successor)
+            on_path.add(successor)
+            if is_goal(successor):
+                return _finish(stats, start_time, path)
+            if len(path) <= limit:
+                stats.expansions += 1
+                stack.append(iter(get_successors(successor)))
+            else:
+                cutoff = True
+                on_path.discard(path.pop())
+
+        if not cutoff:
+            break  # The whole space was searched without hitting the limit
+
+    return _finish(stats, start_time, None)
+
+def bidirectional_search(start, goal, get_successors, get_predecessors=None):
+    """
+    Breadth-first search from both ends that stops once the two searches meet.
+    get_predecessors defaults to get_successors, which is correct whenever
+    every move can be undone. The smaller frontier is expanded one full layer
+    at a time and the cheapest meeting point in that layer is kept, which
+    makes the returned path a shortest one.
+    """
+    stats = SearchStats("bidirectional")
+    start_time = time()
+    if start == goal:
+        return _finish(stats, start_time, [start])
+
+    expand = (get_successors, get_predecessors or get_successors)
+    parents = ({start: None}, {goal: None})
+    dist = ({start: 0}, {goal: 0})
+    frontiers = (deque([start]), deque([goal]))
+
+    while frontiers[0] and frontiers[1]:
+        stats.peak_frontier = max(stats.peak_frontier, len(frontiers[0]) + len(frontiers[1]))
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - side
+        frontier = frontiers[side]
+        best_len, best_pair = None, None
+
+        for _ in range(len(frontier)):
+            current = frontier.popleft()
+            stats.expansions += 1
+            for neighbour in expand[side](current):
+                if neighbour in dist[other]:
+                    length = dist[side][current] + 1 + dist[other][neighbour]
+                    if best_len is None or length < best_len:
+                        best_len, best_pair = length, (current, neighbour)
+                if neighbour not in parents[side]:
+                    parents[side][neighbour] = current
+                    dist[side][neighbour] = dist[side][current] + 1
+                    frontier.append(neighbour)
+
+        if best_pair is not None:
+            near, far = best_pair if side == 0 else best_pair[::-1]
+            path = _walk_parents(parents[0], near)[::-1] + _walk_parents(parents[1], far)
+            return _finish(stats, start_time, path)
+
+    return _finish(stats, start_time, None)
+
+STRATEGIES = ("bfs", "iddfs", "bidirectional")
+
+def run_search(strategy, start, goal, get_successors, get_predecessors=None):
+    """Runs one of STRATEGIES from 'start' to the single state 'goal'."""
+    if strategy == "bfs":
+        return breadth_first_search(start, lambda state: state == goal, get_successors)
+    if strategy == "iddfs":
+        return iterative_deepening_search(start, lambda state: state == goal, get_successors)
+    if strategy == "bidirectional":
+        return bidirectional_search(start, goal, get_successors, get_predecessors)
+    raise ValueError(f"Unknown search strategy '{strategy}', expected one of {STRATEGIES}")
@@ -1,6 +1,14 @@
 import numpy as np
 import heapq 
 import sys
+from instrumentation import run_profiled
+
+def state_key(state):
+    """
+    Hashable key for a state from either backend: packed states are already
+    ints, numpy boards are keyed by their raw bytes.
+    """
+    return state if isinstance(state, int) else state.tobytes()
 
 class Node:
     """
@@ -17,9 +25,8 @@ class Node:
     def __lt__(self, other):
         return self.cost < other.cost
 
-    # Using state.tobytes() for hashing is more reliable for numpy arrays
     def __hash__(self):
-        return hash(self.state.tobytes())
+        return hash(state_key(self.state))
 
     def __eq__(self, other):
         return hash(self) == hash(other)
@@ -38,29 +45,99 @@ class PriorityQueue:
     def pop(self):
         return heapq.heappop(self.queue)
 
+    def peek(self):
+        return self.queue[0]
+
     def is_empty(self):
         return len(self.queue) == 0
 
     def __len__(self):
         return len(self.queue)
 
+class BucketPriorityQueue:
+    """
+    Open list for integer f-values: buckets[f][g] is a list of nodes.
+    Push and pop are O(1) list operations with no Python-level node
+    comparisons. Among nodes with the lowest f, the one with the largest g
+    (the deepest, closest to the goal) is popped first. Non-integral f or g
+    raises ValueError instead of being truncated into the wrong bucket.
+    """
+    def __init__(self):
+        self.buckets = []
+        self.min_f = 0
+        self.size = 0
+
+    def push(self, node):
+        f, g = int(node.cost), int(node.pcost)
+        if f != node.cost or g != node.pcost:
+            raise ValueError(f"BucketPriorityQueue needs integer f and g, got f={node.cost}, g={node.pcost}; "
+                             "use bucket_queue=False for this heuristic")
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+        bucket = self.buckets[f]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(node)
+        self.size += 1
+        if f < self.min_f:
+            self.min_f = f
+
+    def _lowest_list(self):
+        while not any(self.buckets[self.min_f]):
+            self.min_f += 1
+        bucket = self.buckets[self.min_f]
+        for g in range(len(bucket) - 1, -1, -1):
+            if bucket[g]:
+                return bucket[g]
+
+    def pop(self):
+        self.size -= 1
+        return self._lowest_list().pop()
+
+    def peek(self):
+        return self._lowest_list()[-1]
+
+    def is_empty(self):
+        return self.size == 0
+
+    def __len__(self):
+        return self.size
+
 class Agent:
     """
     The A* search agent that solves the 8-puzzle.
+    A best-g table keeps a successor out of the frontier unless it is cheaper
+    than every copy of that state generated so far.
     """
-    def __init__(self, env, heuristic_func):
+    def __init__(self, env, heuristic_func, heuristic_delta=None, bucket_queue=True, profiler=None,
+                 heuristic_batch=None):
         self.env = env
         self.heuristic = heuristic_func
-        self.frontier = PriorityQueue()
+        # Optional incremental form of the heuristic, e.g. manhattan_delta:
+        # h(child) = h(parent) + heuristic_delta(parent, child, goal)
+        self.heuristic_delta = heuristic_delta
+        # Optional batched form, e.g. manhattan_batch, scoring all successors in one call:
+        # heuristic_batch(parent, h(parent), children, goal) -> [h(child), ...]
+        self.heuristic_batch = heuristic_batch
+        # Bucket queue needs integer f-values; use the heap for anything else
+        self.frontier = BucketPriorityQueue() if bucket_queue else PriorityQueue()
         self.explored = set()
+        self.best_g = {}  # state key -> cheapest g generated so far
+        self.max_frontier_size = 0
         self.goal_node = None
         self.nodes_expanded = 0
+        # Optional instrumentation.MemoryProfiler; its result is stored in memory_profile
+        self.profiler = profiler
+        self.memory_profile = None
 
     def run(self):
         """
         Executes the A* search algorithm.
         Returns a tuple of (nodes_expanded, solution_depth).
         """
+        return run_profiled(self, self._run_search)
+
+    def _run_search(self):
         start_state = self.env.get_start_state()
         goal_state = self.env.goal_state
         
@@ -68,28 +145,44 @@ class Agent:
         h_cost = self.heuristic(start_state, goal_state)
         init_node = Node(state=start_state, parent=None, pcost=0, hcost=h_cost)
         self.frontier.push(init_node)
+        self.best_g[state_key(start_state)] = 0
 
         while not self.frontier.is_empty():
+            self.max_frontier_size = max(self.max_frontier_size, len(self.frontier))
             curr_node = self.frontier.pop()
 
-            if hash(curr_node) in self.explored:
+            curr_key = state_key(curr_node.state)
+            # Skip closed states and copies superseded by a cheaper one
+            if curr_key in self.explored or curr_node.pcost > self.best_g[curr_key]:
                 continue
             
-            self.explored.add(hash(curr_node))
+            self.explored.add(curr_key)
             self.nodes_expanded += 1
+            if self.profiler is not None:
+                self.profiler.sample(self.nodes_expanded, len(self.frontier), len(self.explored))
 
             if self.env.reached_goal(curr_node.state):
                 self.goal_node = curr_node
                 return self.nodes_expanded, self.get_solution_depth()
 
-            for next_state in self.env.get_possible_moves(curr_node.state):
-                node_hash = hash(next_state.tobytes())
-                if node_hash not in self.explored:
-                    h_cost = self.heuristic(next_state, goal_state)
+            next_g = curr_node.pcost + 1 # Uniform cost of 1 per move
+            next_states = self.env.get_possible_moves(curr_node.state)
+            if self.heuristic_batch is not None:
+                next_hs = self.heuristic_batch(curr_node.state, curr_node.hcost, next_states, goal_state)
+            for i, next_state in enumerate(next_states):
+                next_key = state_key(next_state)
+                if next_key not in self.explored and next_g < self.best_g.get(next_key, next_g + 1):
+                    self.best_g[next_key] = next_g
+                    if self.heuristic_batch is not None:
+                        h_cost = next_hs[i]
+                    elif self.heuristic_delta is not None:
+                        h_cost = curr_node.hcost + self.heuristic_delta(curr_node.state, next_state, goal_state)
+                    else:
+                        h_cost = self.heuristic(next_state, goal_state)
                     new_node = Node(
                         state=next_state,
                         parent=curr_node,
-                        pcost=curr_node.pcost + 1, # Uniform cost of 1 per move
+                        pcost=next_g,
                         hcost=h_cost
                     )
                     self.frontier.push(new_node)
@@ -120,10 +213,13 @@ class Agent:
 
     def get_memory_usage(self):
         """
-        Estimates memory usage by the frontier and explored sets.
-        This is a rough estimate; actual memory usage is more complex.
+        Peak bytes allocated during the search when run with a profiler.
+        Otherwise estimates memory usage by the final frontier and explored sets;
+        that rough estimate ignores state arrays, parent chains and the peak.
         """
-        frontier_mem = len(self.frontier) * sys.getsizeof(self.frontier.queue[0]) if not self.frontier.is_empty() else 0
+        if self.memory_profile is not None:
+            return self.memory_profile.peak_bytes
+        frontier_mem = len(self.frontier) * sys.getsizeof(self.frontier.peek()) if not self.frontier.is_empty() else 0
         # For a set, we estimate based on the size of a sample item
         explored_mem = len(self.explored) * sys.getsizeof(next(iter(self.explored))) if self.explored else 0
         return frontier_mem + explored_mem
\ No newline at end of file
@@ -0,0 +1,204 @@
+import heapq
+import sys
+from time import time
+from agent import state_key
+from instrumentation import run_profiled
+
+class AnytimeAgent:
+    """
+    Anytime Repairing A* (ARA*) agent for N x N sliding puzzles.
+
+    The first search is weighted A* with f = g + weight * h, which finds a
+    solution quickly whose cost is at most 'weight' times the optimum. The
+    weight is then lowered step by step; each later search reuses the g-values
+    of the previous ones and only re-expands states whose g improved, so the
+    solution is refined until it is proven optimal or the time or memory
+    budget runs out. run() always returns the best solution found so far.
+
+    - time_budget: seconds, or None for no limit
+    - memory_budget: maximum number of states held in the search tables, or None
+    After every search pass the best solution so far is appended to
+    self.solutions as (elapsed seconds, weight, solution cost, suboptimality
+    bound, nodes expanded).
+    """
+    def __init__(self, env, heuristic_func, heuristic_delta=None, initial_weight=3.0, weight_step=0.5,
+                 time_budget=None, memory_budget=None, profiler=None):
+        self.env = env
+        self.heuristic = heuristic_func
+        self.heuristic_delta = heuristic_delta
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.time_budget = time_budget
+        self.memory_budget = memory_budget
+        self.g = {}        # state key -> cheapest g found so far
+        self.h = {}        # state key -> heuristic value
+        self.parent = {}   # state key -> (parent key, state)
+        self.closed = set()
+        self.incons = set()  # Closed states whose g improved during the current search
+        self.open = []
+        self.solutions = []
+        self.path = []
+        self.out_of_budget = False
+        self.max_frontier_size = 0
+        self.nodes_expanded = 0
+        self.elapsed = 0.0
+        # Optional instrumentation.MemoryProfiler; its result is stored in memory_profile
+        self.profiler = profiler
+        self.memory_profile = None
+
+    def run(self):
+        """
+        Executes ARA* until the solution is proven optimal or a budget is spent.
+        Returns a tuple of (nodes_expanded, solution_depth) for the best solution
+        found, or None if no solution was found within the budget.
+        """
+        return run_profiled(self, self._run_searches)
+
+    def _run_searches(self):
+        self._start_time = time()
+        start_state = self.env.get_start_state()
+        goal_state = self.env.goal_state
+        start_key = state_key(start_state)
+        self.g[start_key] = 0
+        self.h[start_key] = self.heuristic(start_state, goal_state)
+        self.parent[start_key] = (None, start_state)
+        self.goal_key = start_key if self.env.reached_goal(start_state) else None
+
+        weight = self.initial_weight
+        self._push(start_key, weight)
+        while True:
+            found = self._improve_path(weight, goal_state)
+            if found:
+                # Parent links may already be cheaper than g(goal) after an interrupted pass
+                self.path = self._extract_path(self.goal_key)
+                cost = len(self.path) - 1
+                # An interrupted pass has not yet established its weight as a bound
+                bound = self._suboptimality_bound(None if self.out_of_budget else weight, cost)
+                self.solutions.append((time() - self._start_time, weight, cost, bound, self.nodes_expanded))
+                if bound <= 1:
+                    break
+            if self.out_of_budget or (not found and not self.open):
+                break
+            # Lower the weight and resume from the states left open or made inconsistent
+            weight = max(1.0, weight - self.weight_step)
+            pending = self._open_keys() | self.incons
+            self.incons = set()
+            self.closed = set()
+            self.open = []
+            for key in pending:
+                self._push(key, weight)
+
+        self.elapsed = time() - self._start_time
+        if not self.path:
+            return None
+        return self.nodes_expanded, self.get_solution_depth()
+
+    def _push(self, key, weight):
+        g = self.g[key]
+        # Ties on f prefer the larger g, i.e. the node closer to the goal
+        heapq.heappush(self.open, (g + weight * self.h[key], -g, key))
+
+    def _open_keys(self):
+        """
+        States still open: heap entries that were neither expanded since they
+        were pushed nor superseded by a cheaper copy. Stale entries are left
+        out, so a new pass never re-expands closed states whose g did not improve.
+        """
+        return {key for _, neg_g, key in self.open if key not in self.closed and -neg_g == self.g[key]}
+
+    def _over_budget(self):
+        if self.time_budget is not None and time() - self._start_time > self.time_budget:
+            return True
+        return self.memory_budget is not None and len(self.g) > self.memory_budget
+
+    def _improve_path(self, weight, goal_state):
+        """
+        One weighted A* pass. Stops when no open state can lead to a cheaper
+        solution under the current weight. Returns True if a solution is known.
+        """
+        best_cost = self.g[self.goal_key] if self.goal_key is not None else None
+        while self.open:
+            f, neg_g, key = self.open[0]
+            if best_cost is not None and best_cost <= f:
+                break
+            heapq.heappop(self.open)
+            # Skip closed states and entries superseded by a cheaper copy
+            if key in self.closed or -neg_g != self.g[key]:
+                continue
+            if self.nodes_expanded % 256 == 0 and self._over_budget():
+                heapq.heappush(self.open, (f, neg_g, key))
+                self.out_of_budget = True
+                break
+
+            self.closed.add(key)
+            self.nodes_expanded += 1
+            self.max_frontier_size = max(self.max_frontier_size, len(self.open))
+            if self.profiler is not None:
+                self.profiler.sample(self.nodes_expanded, len(self.open), len(self.closed))
+
+            state = self.parent[key][1]
+            next_g = self.g[key] + 1  # Uniform cost of 1 per move
+            for next_state in self.env.get_possible_moves(state):
+                next_key = state_key(next_state)
+                if next_g < self.g.get(next_key, next_g + 1):
+                    self.g[next_key] = next_g
+                    self.parent[next_key] = (key, next_state)
+                    # The goal is recorded when generated; it never needs expanding
+                    if self.env.reached_goal(next_state):
+                        self.goal_key = next_key
+                        best_cost = next_g
+                        continue
+                    if next_key not in self.h:
+                        if self.heuristic_delta is not None:
+                            self.h[next_key] = self.h[key] + self.heuristic_delta(state, next_state, goal_state)
+                        else:
+                            self.h[next_key] = self.heuristic(next_state, goal_state)
+                    if next_key in self.closed:
+                        self.incons.add(next_key)
+                    else:
+                        self._push(next_key, weight)
+        return best_cost is not None
+
+    def _suboptimality_bound(self, weight, cost):
+        """
+        cost / (lowest g + h over all states that could still improve the
+        solution) bounds how far the solution can be from the optimum.
+        """
+        lower_bound = cost
+        for key in self._open_keys() | self.incons:
+            lower_bound = min(lower_bound, self.g[key] + self.h[key])
+        if lower_bound <= 0:
+            return 1.0
+        bound = cost / lower_bound
+        return bound if weight is None else min(weight, bound)
+
+    def _extract_path(self, key):
+        path = []
+        while key is not None:
+            parent_key, state = self.parent[key]
+            path.append(state)
+            key = parent_key
+        return path[::-1]
+
+    def get_solution_depth(self):
+        """Calculates the depth of the best solution found."""
+        return len(self.path) - 1 if self.path else 0
+
+    def get_solution_path(self):
+        return list(self.path)
+
+    def get_solution_bound(self):
+        """Proven suboptimality bound of the best solution (1.0 means optimal)."""
+        return self.solutions[-1][3] if self.solutions else None
+
+    def get_memory_usage(self):
+        """
+        Peak bytes allocated during the search when run with a profiler.
+        Otherwise a rough estimate from the number of entries in the search tables.
+        """
+        if self.memory_profile is not None:
+            return self.memory_profile.peak_bytes
+        if not self.g:
+            return 0
+        sample_key = next(iter(self.g))
+        return len(self.g) * 3 * sys.getsizeof(sample_key) + len(self.open) * sys.getsizeof(self.open[0] if self.open else ())
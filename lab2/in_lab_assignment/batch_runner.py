@@ -0,0 +1,168 @@
+"""
+Parallel batch runner for the depth sweep in main.run_experiment.
+
+Every (depth, instance) pair gets its own seed derived from BASE_SEED, so a
+sweep is reproducible and every heuristic is run on exactly the same start
+states. Instances are spread over a process pool and each result is written
+to the CSV / JSON-lines output as soon as it finishes.
+"""
+import csv
+import json
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import time
+from environment import Environment, default_goal_state
+from packed_state import PackedEnvironment
+from agent import Agent
+from ida_star_agent import IDAStarAgent
+from anytime_agent import AnytimeAgent
+from bidirectional_agent import BidirectionalAgent
+from heuristics import (heuristic_manhattan, heuristic_misplaced, heuristic_zero, manhattan_delta,
+                        heuristic_linear_conflict, linear_conflict_delta, heuristic_walking_distance)
+from main import GOAL_STATE
+from instrumentation import MemoryProfiler
+
+# Workers look these up by name, since the tasks are sent to other processes
+HEURISTICS = {
+    "manhattan": (heuristic_manhattan, manhattan_delta),
+    "misplaced": (heuristic_misplaced, None),
+    "zero": (heuristic_zero, None),
+    "linear_conflict": (heuristic_linear_conflict, linear_conflict_delta),
+    "walking_distance": (heuristic_walking_distance, None),
+}
+AGENTS = {"astar": Agent, "idastar": IDAStarAgent, "anytime": AnytimeAgent,
+          "bidirectional": BidirectionalAgent}
+BACKENDS = {"numpy": Environment, "packed": PackedEnvironment}
+
+RESULT_FIELDS = ["heuristic", "agent", "backend", "board_size", "depth", "instance", "seed", "profile_memory",
+                 "solved", "solution_depth", "nodes_expanded", "time", "memory_kb",
+                 "peak_frontier", "bytes_per_expansion"]
+
+def instance_seed(base_seed, depth, instance):
+    """Seed for one instance, independent of the heuristic being tested."""
+    return [base_seed, depth, instance]
+
+def solve_instance(task):
+    """Generates and solves one instance. Runs inside a worker process."""
+    heuristic, heuristic_delta = HEURISTICS[task["heuristic"]]
+    backend = BACKENDS[task["backend"]]
+    goal_state = GOAL_STATE if task["board_size"] == 3 else default_goal_state(task["board_size"])
+    env = backend(depth=task["depth"], goal_state=goal_state, rng=np.random.default_rng(task["seed"]))
+    agent = AGENTS[task["agent"]](env=env, heuristic_func=heuristic, heuristic_delta=heuristic_delta)
+
+    start_time = time()
+    result = agent.run()
+    elapsed = time() - start_time
+
+    row = dict(task, solved=result is not None, time=elapsed, solution_depth=None, nodes_expanded=None)
+    if result:
+        row["nodes_expanded"], row["solution_depth"] = result
+
+    if task["profile_memory"]:
+        # Solve the same instance again under tracemalloc so its overhead stays out of the timing
+        profiled_agent = AGENTS[task["agent"]](env=env, heuristic_func=heuristic, heuristic_delta=heuristic_delta,
+                                               profiler=MemoryProfiler())
+        profiled_agent.run()
+        profile = profiled_agent.memory_profile
+        row["memory_kb"] = profile.peak_bytes / 1024
+        row["peak_frontier"] = profile.peak_frontier
+        row["bytes_per_expansion"] = profile.bytes_per_expansion
+    else:
+        # Rough estimate from the search tables; IDA* keeps no frontier
+        memory = agent.get_memory_usage()
+        row["memory_kb"] = memory / 1024
+        row["peak_frontier"] = getattr(agent, "max_frontier_size", None)
+        row["bytes_per_expansion"] = memory / row["nodes_expanded"] if row["nodes_expanded"] else 0.0
+    row["seed"] = "-".join(str(part) for part in task["seed"])
+    return row
+
+def make_tasks(depths, num_runs_per_depth, heuristics, agent="astar", backend="packed", board_size=3, base_seed=0,
+               profile_memory=False):
+    """
+    One task per (depth, instance, heuristic). With 'profile_memory' every
+    instance is solved a second time under tracemalloc for the true peak
+    allocation, which doubles the run time; otherwise memory is the agent's
+    own estimate.
+    """
+    tasks = []
+    for depth in depths:
+        for instance in range(num_runs_per_depth):
+            for heuristic in heuristics:
+                tasks.append({
+                    "heuristic": heuristic, "agent": agent, "backend": backend, "board_size": board_size,
+                    "depth": depth, "instance": instance, "seed": instance_seed(base_seed, depth, instance),
+                    "profile_memory": profile_memory,
+                })
+    return tasks
+
+def run_batch(tasks, csv_path=None, jsonl_path=None, max_workers=None):
+    """
+    Solves all tasks on a process pool (one worker per core by default) and
+    streams each result row to the given files as it completes.
+    Returns the list of result rows.
+    """
+    rows = []
+    csv_file = open(csv_path, "w", newline="") if csv_path else None
+    jsonl_file = open(jsonl_path, "w") if jsonl_path else None
+    try:
+        writer = csv.DictWriter(csv_file, fieldnames=RESULT_FIELDS) if csv_file else None
+        if writer:
+            writer.writeheader()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(solve_instance, task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                rows.append(row)
+                if writer:
+                    writer.writerow(row)
+                    csv_file.flush()
+                if jsonl_file:
+                    jsonl_file.write(json.dumps(row) + "\n")
+                    jsonl_file.flush()
+                print(f"Finished {done}/{len(tasks)} instances...", end='\r')
+    finally:
+        if csv_file:
+            csv_file.close()
+        if jsonl_file:
+            jsonl_file.close()
+    print()
+    return rows
+
+def print_summary(rows):
+    """
+    Averages per (agent, backend, heuristic, depth), in the same layout as
+    main.run_experiment. Profiled and estimated memory are kept in separate
+    rows, marked in the 'Memory' column.
+    """
+    print(f"{'Agent':<15}{'Backend':<9}{'Heuristic':<18}{'Depth':<10}{'Avg Time (s)':<15}"
+          f"{'Memory':<11}{'Avg Memory (KB)':<20}{'Avg Nodes Expanded':<20}")
+    print("-" * 118)
+    groups = {}
+    for row in rows:
+        if row["solved"]:
+            key = (row["agent"], row["backend"], row["heuristic"], row["depth"], row["profile_memory"])
+            groups.setdefault(key, []).append(row)
+    for (agent, backend, heuristic, depth, profiled), group in sorted(groups.items()):
+        count = len(group)
+        source = "profiled" if profiled else "estimate"
+        print(f"{agent:<15}{backend:<9}{heuristic:<18}{depth:<10}{sum(r['time'] for r in group) / count:<15.4f}"
+              f"{source:<11}{sum(r['memory_kb'] for r in group) / count:<20.2f}"
+              f"{sum(r['nodes_expanded'] for r in group) / count:<20.1f}")
+
+if __name__ == "__main__":
+    DEPTHS = [2, 5, 8, 10, 12, 15, 18, 20, 25, 30]
+    NUM_RUNS_PER_DEPTH = 100
+    BASE_SEED = 2024
+    OUTPUT_DIR = "results"
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    tasks = make_tasks(DEPTHS, NUM_RUNS_PER_DEPTH, ["manhattan", "misplaced"], base_seed=BASE_SEED)
+    print(f"Running {len(tasks)} instances on {os.cpu_count()} cores")
+
+    start_time = time()
+    rows = run_batch(tasks,
+                     csv_path=os.path.join(OUTPUT_DIR, "batch_results.csv"),
+                     jsonl_path=os.path.join(OUTPUT_DIR, "batch_results.jsonl"))
+    print(f"Total wall time: {time() - start_time:.2f}s\n")
+    print_summary(rows)
@@ -0,0 +1,181 @@
+import heapq
+import sys
+from time import time
+from agent import state_key
+from instrumentation import run_profiled
+
+class SearchDirection:
+    """
+    Open and closed lists of one side of a bidirectional search. The open
+    list is kept in three lazy heaps, ordered by MM priority, by f and by g,
+    so that the termination test can read all three minima. Heap entries are
+    stale once the state is closed or reached again with a smaller g.
+    """
+    def __init__(self, target_state):
+        self.target_state = target_state  # The state this side searches towards
+        self.g = {}
+        self.h = {}
+        self.parent = {}  # state key -> (parent key, state)
+        self.closed = set()
+        self.by_priority = []
+        self.by_f = []
+        self.by_g = []
+        self.open = set()
+        self.nodes_expanded = 0
+
+    def push(self, key, state, g, h, parent_key):
+        self.g[key] = g
+        self.h[key] = h
+        self.parent[key] = (parent_key, state)
+        self.closed.discard(key)
+        self.open.add(key)
+        # MM priority: never expand a node past the midpoint before it is needed
+        heapq.heappush(self.by_priority, (max(g + h, 2 * g), g, key))
+        heapq.heappush(self.by_f, (g + h, g, key))
+        heapq.heappush(self.by_g, (g, g, key))
+
+    def _is_stale(self, entry):
+        return entry[2] in self.closed or entry[1] != self.g[entry[2]]
+
+    def _min(self, heap):
+        while heap and self._is_stale(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def min_priority(self):
+        return self._min(self.by_priority)
+
+    def min_f(self):
+        return self._min(self.by_f)
+
+    def min_g(self):
+        return self._min(self.by_g)
+
+    def pop(self):
+        """Closes and returns the key of the open state with the lowest priority."""
+        self.min_priority()
+        _, _, key = heapq.heappop(self.by_priority)
+        self.closed.add(key)
+        self.open.discard(key)
+        self.nodes_expanded += 1
+        return key
+
+    def path_from(self, key):
+        """States from 'key' back to this side's root."""
+        path = []
+        while key is not None:
+            parent_key, state = self.parent[key]
+            path.append(state)
+            key = parent_key
+        return path
+
+class BidirectionalAgent:
+    """
+    Bidirectional heuristic search (MM, Holte et al. 2016) for N x N sliding
+    puzzles. One side searches forward from the start with h(n, goal), the
+    other backward from the goal with h(n, start); moves are reversible, so
+    both sides share the environment's successor function. Each side expands
+    nodes in order of max(g + h, 2g), which guarantees the two searches meet
+    in the middle. The best path through a state seen by both sides is U; the
+    search stops once
+        U <= max(C, fmin_forward, fmin_backward, gmin_forward + gmin_backward + 1)
+    where C is the smaller of the two sides' lowest priorities, at which point
+    U is optimal. Exposes the same interface as Agent.
+    """
+    def __init__(self, env, heuristic_func, heuristic_delta=None, profiler=None):
+        self.env = env
+        self.heuristic = heuristic_func
+        self.heuristic_delta = heuristic_delta
+        self.forward = None
+        self.backward = None
+        self.path = []
+        self.best_cost = None
+        self.nodes_expanded = 0
+        self.max_frontier_size = 0
+        self.elapsed = 0.0
+        # Optional instrumentation.MemoryProfiler; its result is stored in memory_profile
+        self.profiler = profiler
+        self.memory_profile = None
+
+    def run(self):
+        """
+        Executes the bidirectional search.
+        Returns a tuple of (nodes_expanded, solution_depth), or None if no solution exists.
+        """
+        return run_profiled(self, self._run_search)
+
+    def _run_search(self):
+        start_time = time()
+        start_state = self.env.get_start_state()
+        goal_state = self.env.goal_state
+        self.forward = SearchDirection(goal_state)
+        self.backward = SearchDirection(start_state)
+        start_key, goal_key = state_key(start_state), state_key(goal_state)
+        self.forward.push(start_key, start_state, 0, self.heuristic(start_state, goal_state), None)
+        self.backward.push(goal_key, goal_state, 0, self.heuristic(goal_state, start_state), None)
+        meeting_key = None
+        if start_key == goal_key:
+            self.best_cost, meeting_key = 0, start_key
+
+        while self.forward.open and self.backward.open:
+            forward_priority = self.forward.min_priority()
+            backward_priority = self.backward.min_priority()
+            if self.best_cost is not None:
+                lower_bound = max(min(forward_priority, backward_priority),
+                                  self.forward.min_f(), self.backward.min_f(),
+                                  self.forward.min_g() + self.backward.min_g() + 1)
+                if self.best_cost <= lower_bound:
+                    break
+
+            # Expand the side whose best open node has the lower priority
+            if forward_priority <= backward_priority:
+                side, other = self.forward, self.backward
+            else:
+                side, other = self.backward, self.forward
+            self.max_frontier_size = max(self.max_frontier_size, len(self.forward.open) + len(self.backward.open))
+            key = side.pop()
+            self.nodes_expanded += 1
+            if self.profiler is not None:
+                self.profiler.sample(self.nodes_expanded, len(self.forward.open) + len(self.backward.open),
+                                     len(self.forward.closed) + len(self.backward.closed))
+
+            state = side.parent[key][1]
+            next_g = side.g[key] + 1  # Uniform cost of 1 per move
+            for next_state in self.env.get_possible_moves(state):
+                next_key = state_key(next_state)
+                if next_g >= side.g.get(next_key, next_g + 1):
+                    continue
+                if self.heuristic_delta is not None:
+                    next_h = side.h[key] + self.heuristic_delta(state, next_state, side.target_state)
+                else:
+                    next_h = self.heuristic(next_state, side.target_state)
+                side.push(next_key, next_state, next_g, next_h, key)
+                if next_key in other.g:
+                    cost = next_g + other.g[next_key]
+                    if self.best_cost is None or cost < self.best_cost:
+                        self.best_cost, meeting_key = cost, next_key
+
+        self.elapsed = time() - start_time
+        if meeting_key is None:
+            return None
+        self.path = self.forward.path_from(meeting_key)[::-1] + self.backward.path_from(meeting_key)[1:]
+        return self.nodes_expanded, self.get_solution_depth()
+
+    def get_solution_depth(self):
+        """Calculates the depth of the solution path."""
+        return len(self.path) - 1 if self.path else 0
+
+    def get_solution_path(self):
+        return list(self.path)
+
+    def get_memory_usage(self):
+        """
+        Peak bytes allocated during the search when run with a profiler.
+        Otherwise a rough estimate from the number of states held by both sides.
+        """
+        if self.memory_profile is not None:
+            return self.memory_profile.peak_bytes
+        if self.forward is None:
+            return 0
+        stored = len(self.forward.g) + len(self.backward.g)
+        return stored * 3 * sys.getsizeof(next(iter(self.forward.g)))
@@ -1,14 +1,37 @@
 import numpy as np
 
+def default_goal_state(size):
+    """Row-major goal for an N x N puzzle: tiles 1..N*N-1 followed by the blank."""
+    labels = [str(tile) for tile in range(1, size * size)] + ['_']
+    return np.array(labels).reshape(size, size)
+
+def permutation_parity(tile_codes, size):
+    """
+    Parity invariant of a board given as tile codes per cell (0 for the blank).
+    Every move preserves it, so two boards with different parity can never
+    reach each other. For odd widths it is the inversion count of the tiles;
+    for even widths a vertical move also changes the inversion count by an
+    odd amount, so the blank's row is added.
+    """
+    numbers = [code for code in tile_codes if code]
+    inversions = sum(1 for i in range(len(numbers)) for j in range(i + 1, len(numbers)) if numbers[i] > numbers[j])
+    if size % 2 == 0:
+        inversions += tile_codes.index(0) // size
+    return inversions % 2
+
 class Environment:
     """
-    Represents the 8-Puzzle environment.
+    Represents the N x N sliding puzzle environment (the 8-puzzle for N = 3).
+    The board width is taken from the goal state.
     - Generates a solvable start state by making 'depth' random moves from the goal state.
     - Provides valid next states from a given state.
     - Checks if the goal state has been reached.
     """
-    def __init__(self, depth, goal_state):
+    def __init__(self, depth, goal_state, rng=None):
         self.goal_state = goal_state
+        self.size = self._get_board_size(goal_state)
+        # Optional numpy Generator for reproducible instances; None uses the global np.random state
+        self.rng = rng
         self.start_state = self._generate_start_state(depth)
 
     def _generate_start_state(self, depth):
@@ -16,16 +39,39 @@ class Environment:
         Generates a start state by moving backward from the goal.
         This ensures that the generated puzzle is always solvable.
         """
-        current_state = np.copy(self.goal_state)
+        # _get_next_states always returns fresh states, so the goal is never modified
+        current_state = self.goal_state
         for _ in range(depth):
             possible_next_states = self._get_next_states(current_state)
             # Choose a random move
-            current_state = possible_next_states[np.random.randint(0, len(possible_next_states))]
+            if self.rng is not None:
+                move = self.rng.integers(0, len(possible_next_states))
+            else:
+                move = np.random.randint(0, len(possible_next_states))
+            current_state = possible_next_states[move]
         return current_state
     
     def get_start_state(self):
         return self.start_state
 
+    def is_solvable(self, state):
+        """Parity check: True if the goal can be reached from 'state'."""
+        return (permutation_parity(self._get_tile_codes(state), self.size)
+                == permutation_parity(self._get_tile_codes(self.goal_state), self.size))
+
+    def set_start_state(self, state):
+        """Uses a user-supplied start state, rejecting it at once if it cannot reach the goal."""
+        if not self.is_solvable(state):
+            raise ValueError("Start state is not solvable: it has the wrong permutation parity for this goal")
+        self.start_state = state
+
+    def _get_tile_codes(self, state):
+        """Tile numbers cell by cell, with 0 for the blank."""
+        return [0 if label == '_' else int(label) for label in state.ravel().tolist()]
+
+    def _get_board_size(self, state):
+        return state.shape[0]
+
     def _get_blank_space_pos(self, state):
         """Helper function to find the (row, col) of the blank space '_'."""
         pos = np.where(state == '_')
@@ -41,7 +87,7 @@ class Environment:
 
         for dr, dc in moves:
             new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
+            if 0 <= new_row < self.size and 0 <= new_col < self.size:
                 new_state = np.copy(state)
                 # Swap the blank tile with the adjacent tile
                 new_state[row, col], new_state[new_row, new_col] = new_state[new_row, new_col], new_state[row, col]
@@ -1,10 +1,66 @@
 import numpy as np
+from collections import OrderedDict
+from packed_state import BLANK_LABEL, blank_index, tables_for, tile_at, tiles
+
+# Per-goal tables kept at once, least recently used first out. The bidirectional
+# agent scores states against every instance's start, so an unbounded cache
+# would keep one table per instance of a batch run.
+GOAL_CACHE_SIZE = 8
+# Largest board whose walking-distance pattern space can be enumerated
+WALKING_DISTANCE_MAX_SIZE = 4
+
+_manhattan_tables = OrderedDict()
+_linear_conflict_tables = OrderedDict()
+_walking_distance_tables = OrderedDict()
+_walking_distance_patterns = {}
+
+def _goal_key(goal_state):
+    """Cache key for per-goal tables, for either backend."""
+    return goal_state if isinstance(goal_state, int) else (goal_state.shape, goal_state.tobytes())
+
+def _cache_get(cache, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def _cache_put(cache, key, value):
+    cache[key] = value
+    if len(cache) > GOAL_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def _board_tiles(state):
+    """Tiles cell by cell: tile codes for packed states, labels for numpy boards."""
+    return tiles(state) if isinstance(state, int) else state.ravel().tolist()
+
+def manhattan_table(goal_state):
+    """
+    Lookup table of Manhattan distances: table[tile][cell] is how far 'tile'
+    sitting in flat cell index 'cell' is from its goal cell. Built once per
+    goal state and cached for the GOAL_CACHE_SIZE most recent goals. Tiles
+    are labels for numpy boards and tile codes for packed states.
+    """
+    packed = isinstance(goal_state, int)
+    key = _goal_key(goal_state)
+    table = _cache_get(_manhattan_tables, key)
+    if table is None:
+        goal_tiles = _board_tiles(goal_state)
+        size = int(round(len(goal_tiles) ** 0.5))
+        table = [None] * len(goal_tiles) if packed else {}
+        for goal_cell, tile in enumerate(goal_tiles):
+            goal_i, goal_j = divmod(goal_cell, size)
+            table[tile] = [abs(i - goal_i) + abs(j - goal_j)
+                           for i in range(size) for j in range(size)]
+        _cache_put(_manhattan_tables, key, table)
+    return table
 
 def heuristic_misplaced(curr_state, goal_state):
     """
     Heuristic 1: Counts the number of misplaced tiles.
     An admissible heuristic since every misplaced tile must be moved at least once.
     """
+    if isinstance(curr_state, int):
+        return sum(a != b for a, b in zip(tiles(curr_state), tiles(goal_state)))
     # The sum of a boolean array where True is 1 and False is 0
     return np.sum(curr_state != goal_state)
 
@@ -15,22 +71,248 @@ def heuristic_manhattan(curr_state, goal_state):
     For each tile, it sums the vertical and horizontal distance to its goal position.
     This is also admissible and generally more informed than the misplaced tiles heuristic.
     """
-    dist = 0
-    for i in range(3):
-        for j in range(3):
-            tile = curr_state[i, j]
-            if tile != '_':
-                # Find the coordinates of the tile in the goal state
-                goal_pos = np.where(goal_state == tile)
-                goal_i, goal_j = goal_pos[0][0], goal_pos[1][0]
-                
-                # Add the Manhattan distance
-                dist += abs(i - goal_i) + abs(j - goal_j)
-    return dist
+    table = manhattan_table(goal_state)
+    if isinstance(curr_state, int):
+        return sum(table[tile][cell] for cell, tile in enumerate(tiles(curr_state)) if tile)
+    return sum(table[tile][cell] for cell, tile in enumerate(curr_state.ravel().tolist()) if tile != BLANK_LABEL)
+
+def manhattan_delta(parent_state, child_state, goal_state):
+    """
+    Change in Manhattan distance between a state and one of its successors.
+    Only the tile that slid into the parent's blank cell moved, so the
+    difference is two table lookups: h(child) = h(parent) + delta.
+    """
+    table = manhattan_table(goal_state)
+    if isinstance(parent_state, int):
+        from_cell = blank_index(child_state)
+        to_cell = blank_index(parent_state)
+        tile = tile_at(child_state, to_cell)
+    else:
+        parent_tiles = parent_state.ravel().tolist()
+        from_cell = child_state.ravel().tolist().index(BLANK_LABEL)
+        to_cell = parent_tiles.index(BLANK_LABEL)
+        tile = parent_tiles[from_cell]
+    row = table[tile]
+    return row[to_cell] - row[from_cell]
 
 def heuristic_zero(curr_state, goal_state):
     """
     Heuristic 0: A trivial heuristic that always returns 0.
     Using this heuristic turns the A* search into Uniform Cost Search (or Dijkstra's Algorithm).
     """
-    return 0
\ No newline at end of file
+    return 0
+
+def manhattan_batch(parent_state, parent_h, children, goal_state):
+    """
+    Manhattan distances of all successors of 'parent_state' in one call,
+    given the parent's own value. The table, the parent's blank cell and its
+    tiles are looked up once for the whole batch, then each child costs one
+    table row: the moved tile is the parent's tile in the child's blank cell.
+    Returns a list of heuristic values in the order of 'children'.
+    """
+    table = manhattan_table(goal_state)
+    if isinstance(parent_state, int):
+        board_tables = tables_for(parent_state)
+        shifts, tile_mask = board_tables.shifts, board_tables.tile_mask
+        to_cell = blank_index(parent_state)
+        scores = []
+        for child in children:
+            from_cell = blank_index(child)
+            row = table[(parent_state >> shifts[from_cell]) & tile_mask]
+            scores.append(parent_h + row[to_cell] - row[from_cell])
+        return scores
+
+    parent_tiles = parent_state.ravel().tolist()
+    to_cell = parent_tiles.index(BLANK_LABEL)
+    scores = []
+    for child in children:
+        from_cell = child.ravel().tolist().index(BLANK_LABEL)
+        row = table[parent_tiles[from_cell]]
+        scores.append(parent_h + row[to_cell] - row[from_cell])
+    return scores
+
+def _line_penalty(code, size):
+    """
+    Linear-conflict penalty of one row or column. 'code' holds, per cell in
+    base size + 1, 1 + the goal position along the line of a tile that
+    belongs to this line (0 for other tiles and the blank). Tiles outside the
+    longest increasing subsequence must leave the line and come back, which
+    costs two moves each beyond their Manhattan distance.
+    """
+    positions = []
+    for _ in range(size):
+        code, digit = divmod(code, size + 1)
+        if digit:
+            positions.append(digit - 1)
+    longest = [1] * len(positions)
+    for i in range(len(positions)):
+        for j in range(i):
+            if positions[j] < positions[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return 2 * (len(positions) - max(longest, default=0))
+
+class LinearConflictTables:
+    """
+    Per-goal tables for the linear-conflict heuristic. row_digits[tile][cell]
+    is the tile's contribution to the code of the row holding 'cell' (nonzero
+    only if that is the tile's goal row), col_digits likewise for columns,
+    and penalty[code] is the precomputed conflict penalty of a line code.
+    """
+    def __init__(self, goal_state):
+        packed = isinstance(goal_state, int)
+        goal_tiles = _board_tiles(goal_state)
+        self.size = size = int(round(len(goal_tiles) ** 0.5))
+        base = size + 1
+        self.row_digits = [None] * len(goal_tiles) if packed else {}
+        self.col_digits = [None] * len(goal_tiles) if packed else {}
+        for goal_cell, tile in enumerate(goal_tiles):
+            goal_i, goal_j = divmod(goal_cell, size)
+            blank = tile == (0 if packed else BLANK_LABEL)
+            self.row_digits[tile] = [0 if blank or i != goal_i else (goal_j + 1) * base ** j
+                                     for i in range(size) for j in range(size)]
+            self.col_digits[tile] = [0 if blank or j != goal_j else (goal_i + 1) * base ** i
+                                     for i in range(size) for j in range(size)]
+        self.penalty = [_line_penalty(code, size) for code in range(base ** size)]
+
+    def row_penalty(self, board_tiles, row):
+        cells = range(row * self.size, (row + 1) * self.size)
+        return self.penalty[sum(self.row_digits[board_tiles[cell]][cell] for cell in cells)]
+
+    def col_penalty(self, board_tiles, col):
+        cells = range(col, self.size * self.size, self.size)
+        return self.penalty[sum(self.col_digits[board_tiles[cell]][cell] for cell in cells)]
+
+def linear_conflict_tables(goal_state):
+    key = _goal_key(goal_state)
+    tables = _cache_get(_linear_conflict_tables, key)
+    if tables is None:
+        tables = LinearConflictTables(goal_state)
+        _cache_put(_linear_conflict_tables, key, tables)
+    return tables
+
+def heuristic_linear_conflict(curr_state, goal_state):
+    """
+    Heuristic 3: Manhattan distance plus two moves for every tile that has to
+    step out of its goal row or column to let another tile of that line past.
+    Admissible and consistent, and never smaller than Manhattan distance.
+    """
+    tables = linear_conflict_tables(goal_state)
+    board_tiles = _board_tiles(curr_state)
+    penalty = sum(tables.row_penalty(board_tiles, line) + tables.col_penalty(board_tiles, line)
+                  for line in range(tables.size))
+    return heuristic_manhattan(curr_state, goal_state) + penalty
+
+def linear_conflict_delta(parent_state, child_state, goal_state):
+    """
+    Change in linear-conflict value between a state and one of its successors.
+    Besides the Manhattan delta, only the rows and columns of the moved
+    tile's old and new cell can change their penalty.
+    """
+    tables = linear_conflict_tables(goal_state)
+    size = tables.size
+    parent_tiles = _board_tiles(parent_state)
+    blank = 0 if isinstance(parent_state, int) else BLANK_LABEL
+    to_cell = parent_tiles.index(blank)
+    from_cell = blank_index(child_state) if isinstance(child_state, int) else child_state.ravel().tolist().index(blank)
+    child_tiles = list(parent_tiles)
+    child_tiles[to_cell], child_tiles[from_cell] = child_tiles[from_cell], blank
+
+    delta = manhattan_delta(parent_state, child_state, goal_state)
+    for row in {from_cell // size, to_cell // size}:
+        delta += tables.row_penalty(child_tiles, row) - tables.row_penalty(parent_tiles, row)
+    for col in {from_cell % size, to_cell % size}:
+        delta += tables.col_penalty(child_tiles, col) - tables.col_penalty(parent_tiles, col)
+    return delta
+
+def _walking_distance_patterns_for(size, blank_line):
+    """
+    Breadth-first search over walking-distance patterns, cached per
+    (size, line of the goal blank). A pattern records, for every line i and
+    goal line j, how many tiles in line i belong in line j, plus the line of
+    the blank; it is encoded as the digits of an int in base size + 1. A move
+    swaps the blank with any tile of an adjacent line. Returns a dict from
+    pattern code to the number of moves needed to reach the goal pattern.
+    """
+    key = (size, blank_line)
+    distances = _walking_distance_patterns.get(key)
+    if distances is not None:
+        return distances
+    base = size + 1
+    blank_weight = base ** (size * size)
+    goal = sum((size - (i == blank_line)) * base ** (i * size + i) for i in range(size)) + blank_line * blank_weight
+    distances = {goal: 0}
+    frontier = [goal]
+    while frontier:
+        next_frontier = []
+        for pattern in frontier:
+            next_distance = distances[pattern] + 1
+            blank = pattern // blank_weight
+            for line in (blank - 1, blank + 1):
+                if not 0 <= line < size:
+                    continue
+                for goal_line in range(size):
+                    weight = base ** (line * size + goal_line)
+                    if (pattern // weight) % base:
+                        next_pattern = (pattern - weight + base ** (blank * size + goal_line)
+                                        + (line - blank) * blank_weight)
+                        if next_pattern not in distances:
+                            distances[next_pattern] = next_distance
+                            next_frontier.append(next_pattern)
+        frontier = next_frontier
+    _walking_distance_patterns[key] = distances
+    return distances
+
+class WalkingDistanceTables:
+    """
+    Per-goal tables for the walking-distance heuristic. row_weights[tile][cell]
+    is what the tile adds to the row pattern code when it sits in 'cell'
+    (the blank adds its row), col_weights likewise for columns, so a pattern
+    code is a sum of N * N table reads. Limited to boards up to 4 x 4: the
+    pattern space of a 5 x 5 board is too large to enumerate.
+    """
+    def __init__(self, goal_state):
+        packed = isinstance(goal_state, int)
+        goal_tiles = _board_tiles(goal_state)
+        self.size = size = int(round(len(goal_tiles) ** 0.5))
+        if size > WALKING_DISTANCE_MAX_SIZE:
+            raise ValueError(f"Walking distance supports boards up to {WALKING_DISTANCE_MAX_SIZE} x "
+                             f"{WALKING_DISTANCE_MAX_SIZE}, not {size} x {size}")
+        base = size + 1
+        blank_weight = base ** (size * size)
+        self.row_weights = [None] * len(goal_tiles) if packed else {}
+        self.col_weights = [None] * len(goal_tiles) if packed else {}
+        for goal_cell, tile in enumerate(goal_tiles):
+            goal_i, goal_j = divmod(goal_cell, size)
+            if tile == (0 if packed else BLANK_LABEL):
+                blank_row, blank_col = goal_i, goal_j
+                self.row_weights[tile] = [(cell // size) * blank_weight for cell in range(size * size)]
+                self.col_weights[tile] = [(cell % size) * blank_weight for cell in range(size * size)]
+            else:
+                self.row_weights[tile] = [base ** ((cell // size) * size + goal_i) for cell in range(size * size)]
+                self.col_weights[tile] = [base ** ((cell % size) * size + goal_j) for cell in range(size * size)]
+        self.row_distances = _walking_distance_patterns_for(size, blank_row)
+        self.col_distances = _walking_distance_patterns_for(size, blank_col)
+
+def walking_distance_tables(goal_state):
+    key = _goal_key(goal_state)
+    tables = _cache_get(_walking_distance_tables, key)
+    if tables is None:
+        tables = WalkingDistanceTables(goal_state)
+        _cache_put(_walking_distance_tables, key, tables)
+    return tables
+
+def heuristic_walking_distance(curr_state, goal_state):
+    """
+    Heuristic 4: Walking distance. Counts the vertical moves needed if tiles
+    only had to reach their goal rows, where any tile of a row is as good as
+    another, plus the same for columns. Each real move advances only one of
+    the two, so the sum is admissible; it captures interactions between tiles
+    that Manhattan distance ignores.
+    """
+    tables = walking_distance_tables(goal_state)
+    row_weights, col_weights = tables.row_weights, tables.col_weights
+    row_pattern = col_pattern = 0
+    for cell, tile in enumerate(_board_tiles(curr_state)):
+        row_pattern += row_weights[tile][cell]
+        col_pattern += col_weights[tile][cell]
+    return tables.row_distances[row_pattern] + tables.col_distances[col_pattern]
@@ -0,0 +1,122 @@
+import sys
+from time import time
+from agent import state_key
+from instrumentation import run_profiled
+
+class IDAStarAgent:
+    """
+    Iterative-deepening A* agent for N x N sliding puzzles.
+
+    Each iteration is a depth-first search that cuts off every node whose
+    f = g + h exceeds the current threshold; the next threshold is the
+    smallest f that was cut off. Only the current path is stored, so memory
+    is O(solution depth) instead of the A* frontier and explored set.
+    Exposes the same run()/get_solution_path()/get_memory_usage() interface
+    as Agent.
+    """
+    def __init__(self, env, heuristic_func, heuristic_delta=None, move_ordering=True, profiler=None):
+        self.env = env
+        self.heuristic = heuristic_func
+        self.heuristic_delta = heuristic_delta
+        # Try successors with the smallest h first, which finds the goal
+        # earlier in the last iteration.
+        self.move_ordering = move_ordering
+        self.path = []
+        self.found = False
+        self.nodes_expanded = 0
+        self.iterations = 0
+        self.expansions_per_threshold = []  # (threshold, nodes expanded in that iteration)
+        self.elapsed = 0.0
+        # Optional instrumentation.MemoryProfiler; its result is stored in memory_profile
+        self.profiler = profiler
+        self.memory_profile = None
+
+    def run(self):
+        """
+        Executes IDA*.
+        Returns a tuple of (nodes_expanded, solution_depth), or None if no solution exists.
+        """
+        return run_profiled(self, self._run_iterations)
+
+    def _run_iterations(self):
+        start_time = time()
+        start_state = self.env.get_start_state()
+        goal_state = self.env.goal_state
+        start_h = self.heuristic(start_state, goal_state)
+        threshold = start_h
+        self.path = [start_state]
+
+        while True:
+            self.iterations += 1
+            expanded_before = self.nodes_expanded
+            next_threshold = self._search(start_state, 0, threshold, None, goal_state, start_h)
+            self.expansions_per_threshold.append((threshold, self.nodes_expanded - expanded_before))
+            if self.found:
+                self.elapsed = time() - start_time
+                return self.nodes_expanded, self.get_solution_depth()
+            if next_threshold is None:
+                self.elapsed = time() - start_time
+                self.path = []
+                return None # The whole space was searched without reaching the goal
+            threshold = next_threshold
+
+    def _search(self, state, g, threshold, parent_key, goal_state, h=None):
+        """
+        Bounded depth-first search below 'state'. Sets self.found and leaves
+        the solution in self.path on success; otherwise returns the smallest f
+        that exceeded 'threshold' (None if nothing was cut off).
+        """
+        if h is None:
+            h = self.heuristic(state, goal_state)
+        f = g + h
+        if f > threshold:
+            return f
+        if self.env.reached_goal(state):
+            self.found = True
+            return None
+
+        self.nodes_expanded += 1
+        if self.profiler is not None:
+            self.profiler.sample(self.nodes_expanded, len(self.path), 0)
+        curr_key = state_key(state)
+        children = []
+        for next_state in self.env.get_possible_moves(state):
+            # Parent-move pruning: never undo the move that led here
+            if parent_key is not None and state_key(next_state) == parent_key:
+                continue
+            if self.heuristic_delta is not None:
+                next_h = h + self.heuristic_delta(state, next_state, goal_state)
+            else:
+                next_h = self.heuristic(next_state, goal_state)
+            children.append((next_h, next_state))
+        if self.move_ordering:
+            children.sort(key=lambda child: child[0])
+
+        min_exceeded = None
+        for next_h, next_state in children:
+            self.path.append(next_state)
+            result = self._search(next_state, g + 1, threshold, curr_key, goal_state, next_h)
+            if self.found:
+                return None
+            self.path.pop()
+            if result is not None and (min_exceeded is None or result < min_exceeded):
+                min_exceeded = result
+        return min_exceeded
+
+    def get_solution_depth(self):
+        """Calculates the depth of the solution path."""
+        return len(self.path) - 1 if self.found else 0
+
+    def get_solution_path(self):
+        return list(self.path) if self.found else []
+
+    def get_memory_usage(self):
+        """
+        Peak bytes allocated during the search when run with a profiler.
+        Otherwise estimates memory held by the search: the current path only.
+        The recursion keeps one frame and one list of children per level,
+        which is proportional to the same depth.
+        """
+        if self.memory_profile is not None:
+            return self.memory_profile.peak_bytes
+        return len(self.path) * sys.getsizeof(self.path[0]) if self.path else 0
@@ -0,0 +1,125 @@
+"""
+Memory instrumentation for the search agents.
+
+MemoryProfiler measures what a search really allocates with tracemalloc
+(numpy registers its buffers there too, so board arrays are included) and
+periodically records the frontier and explored sizes. An optional background
+thread also samples the process RSS. Everything is opt-in because tracemalloc
+slows allocation-heavy code down noticeably.
+"""
+import threading
+import tracemalloc
+from time import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+class SearchProfile:
+    """Result of a profiled search run."""
+    def __init__(self, peak_bytes, final_bytes, nodes_expanded, samples, peak_frontier, peak_explored, peak_rss_bytes):
+        self.peak_bytes = peak_bytes          # Peak bytes allocated during the search
+        self.final_bytes = final_bytes        # Bytes still allocated when the search returned
+        self.nodes_expanded = nodes_expanded
+        self.samples = samples                # (seconds, expansions, frontier size, explored size, allocated bytes)
+        self.peak_frontier = peak_frontier
+        self.peak_explored = peak_explored
+        self.peak_rss_bytes = peak_rss_bytes  # None when no RSS source is available
+
+    @property
+    def bytes_per_expansion(self):
+        return self.peak_bytes / self.nodes_expanded if self.nodes_expanded else 0.0
+
+    def __str__(self):
+        rss = f"{self.peak_rss_bytes / 1024:.0f} KB" if self.peak_rss_bytes is not None else "n/a"
+        return (f"peak allocated: {self.peak_bytes / 1024:.1f} KB, "
+                f"per expansion: {self.bytes_per_expansion:.0f} B, "
+                f"peak frontier: {self.peak_frontier}, peak explored: {self.peak_explored}, "
+                f"peak RSS: {rss}")
+
+class MemoryProfiler:
+    """
+    Call start() before the search, sample() once per expansion and stop()
+    at the end. sample() only records a data point every 'sample_every'
+    expansions; peak frontier/explored sizes are tracked on every call.
+    'rss_interval' (seconds) enables the background RSS sampler.
+    """
+    def __init__(self, sample_every=1000, rss_interval=None):
+        self.sample_every = sample_every
+        self.rss_interval = rss_interval
+        self.samples = []
+        self.peak_frontier = 0
+        self.peak_explored = 0
+        self.peak_rss_bytes = None
+        self._calls = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._baseline, _ = tracemalloc.get_traced_memory()
+        self._start_time = time()
+        if self.rss_interval and psutil is not None:
+            self._thread = threading.Thread(target=self._sample_rss, daemon=True)
+            self._thread.start()
+
+    def _sample_rss(self):
+        process = psutil.Process()
+        while not self._stop_event.wait(self.rss_interval):
+            rss = process.memory_info().rss
+            if self.peak_rss_bytes is None or rss > self.peak_rss_bytes:
+                self.peak_rss_bytes = rss
+
+    def sample(self, nodes_expanded, frontier_size, explored_size):
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if explored_size > self.peak_explored:
+            self.peak_explored = explored_size
+        self._calls += 1
+        if self._calls % self.sample_every == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            self.samples.append((time() - self._start_time, nodes_expanded, frontier_size,
+                                 explored_size, current - self._baseline))
+
+    def stop(self, nodes_expanded):
+        current, peak = tracemalloc.get_traced_memory()
+        if not self._was_tracing:
+            tracemalloc.stop()
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+        elif resource is not None:
+            # Without a sampler, fall back to the kernel's high-water mark (KB on Linux)
+            self.peak_rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return SearchProfile(
+            peak_bytes=max(peak - self._baseline, 0),
+            final_bytes=max(current - self._baseline, 0),
+            nodes_expanded=nodes_expanded,
+            samples=self.samples,
+            peak_frontier=self.peak_frontier,
+            peak_explored=self.peak_explored,
+            peak_rss_bytes=self.peak_rss_bytes,
+        )
+
+def run_profiled(agent, search):
+    """
+    Runs 'search' (the agent's search method) under agent.profiler when one
+    was given, storing the SearchProfile in agent.memory_profile even if the
+    search raises. Shared by the run() methods of all agents.
+    """
+    if agent.profiler is None:
+        return search()
+    agent.profiler.start()
+    try:
+        return search()
+    finally:
+        agent.memory_profile = agent.profiler.stop(agent.nodes_expanded)
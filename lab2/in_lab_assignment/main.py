@@ -1,42 +1,74 @@
 import numpy as np
 from time import time
-from environment import Environment
+from environment import default_goal_state
+from packed_state import PackedEnvironment
 from agent import Agent
-from heuristics import heuristic_manhattan, heuristic_misplaced, heuristic_zero
+from ida_star_agent import IDAStarAgent
+from anytime_agent import AnytimeAgent
+from bidirectional_agent import BidirectionalAgent
+from heuristics import (heuristic_manhattan, heuristic_misplaced, heuristic_zero, manhattan_delta, manhattan_batch,
+                        heuristic_linear_conflict, linear_conflict_delta, heuristic_walking_distance)
+from pattern_database import AdditivePDBHeuristic
+from instrumentation import MemoryProfiler
+from puzzle_oracle import EightPuzzleOracle
 
-def run_experiment():
-    """
-    Runs the 8-puzzle solver for various depths and prints the performance metrics.
-    """
-    # Define the goal state for the 8-puzzle
-    goal_state = np.array([
-        ['1', '2', '3'], 
-        ['8', '_', '4'], 
-        ['7', '6', '5']
-    ])
+# Define the goal state for the 8-puzzle
+GOAL_STATE = np.array([
+    ['1', '2', '3'], 
+    ['8', '_', '4'], 
+    ['7', '6', '5']
+])
+
+# Depths to test. Start with smaller depths first.
+DEPTHS = [2, 5, 8, 10, 12, 15, 18, 20]
 
-    # Depths to test. Start with smaller depths first.
-    depths = [2, 5, 8, 10, 12, 15, 18, 20] 
-    num_runs_per_depth = 10 # Number of random puzzles to average over for each depth
+def run_experiment(goal_state=GOAL_STATE, depths=DEPTHS, agent_class=Agent,
+                   chosen_heuristic=heuristic_manhattan, chosen_delta=manhattan_delta,
+                   chosen_backend=PackedEnvironment, num_runs_per_depth=10, profile_memory=False,
+                   oracle=None, chosen_batch=None):
+    """
+    Runs the puzzle solver for various depths and prints the performance metrics.
 
-    # Choose the heuristic to use for the experiment
-    chosen_heuristic = heuristic_manhattan
-    print(f"Running experiment with heuristic: {chosen_heuristic.__name__}\n")
+    - agent_class: Agent (A*) or IDAStarAgent (memory-bounded IDA*)
+    - chosen_heuristic: e.g. heuristic_manhattan, or AdditivePDBHeuristic(goal_state)
+      for disjoint pattern databases (built once, then memory-mapped from pdb_cache/)
+    - chosen_delta: incremental form of the heuristic, or None to evaluate it from scratch per node
+    - chosen_backend: Environment (numpy arrays) or PackedEnvironment (packed ints)
+    - num_runs_per_depth: number of random puzzles to average over for each depth
+    - profile_memory: report the true peak allocation (tracemalloc) instead of the
+      rough frontier/explored estimate; each instance is then solved a second time
+      under the profiler so its overhead stays out of the timings, which doubles
+      the run time, so it is off by default
+    - oracle: an EightPuzzleOracle for the goal; start states are then drawn uniformly
+      among boards whose optimal solution is exactly 'depth' moves, instead of
+      random walks of 'depth' moves (3 x 3 only)
+    - chosen_batch: batched form of the heuristic for Agent, e.g. manhattan_batch, which
+      scores all successors of a node in one call
+    """
+    print(f"Running {agent_class.__name__} with heuristic: {chosen_heuristic.__name__}, backend: {chosen_backend.__name__}\n")
 
     results = {}
+    agent_options = {"heuristic_batch": chosen_batch} if chosen_batch is not None else {}
 
-    print(f"{'Depth':<10}{'Avg Time (s)':<15}{'Avg Memory (KB)':<20}{'Avg Nodes Expanded':<20}")
+    # Without profiling, memory is the agent's rough estimate from its search tables
+    memory_label = "Avg Memory (KB)" if profile_memory else "Est. Memory (KB)"
+    print(f"{'Depth':<10}{'Avg Time (s)':<15}{memory_label:<20}{'Avg Nodes Expanded':<20}{'Nodes/sec':<15}")
     print("-" * 70)
 
     for depth in depths:
         total_time = 0
         total_mem = 0
         total_nodes = 0
+        total_iterations = 0
 
         for i in range(num_runs_per_depth):
             print(f"Running depth {depth}, instance {i+1}/{num_runs_per_depth}...", end='\r')
-            env = Environment(depth=depth, goal_state=goal_state)
-            agent = Agent(env=env, heuristic_func=chosen_heuristic)
+            if oracle is None:
+                env = chosen_backend(depth=depth, goal_state=goal_state)
+            else:
+                env = chosen_backend(depth=0, goal_state=goal_state)
+                env.set_start_state(oracle.sample_start_state(depth, packed=chosen_backend is PackedEnvironment))
+            agent = agent_class(env=env, heuristic_func=chosen_heuristic, heuristic_delta=chosen_delta, **agent_options)
 
             start_time = time()
             result = agent.run()
@@ -45,8 +77,16 @@ def run_experiment():
             if result:
                 nodes_expanded, soln_depth = result
                 total_time += end_time - start_time
-                total_mem += agent.get_memory_usage() / 1024 # Convert to KB
+                if profile_memory:
+                    profiled_agent = agent_class(env=env, heuristic_func=chosen_heuristic,
+                                                 heuristic_delta=chosen_delta, profiler=MemoryProfiler(),
+                                                 **agent_options)
+                    profiled_agent.run()
+                    total_mem += profiled_agent.get_memory_usage() / 1024 # Convert to KB
+                else:
+                    total_mem += agent.get_memory_usage() / 1024 # Convert to KB
                 total_nodes += nodes_expanded
+                total_iterations += getattr(agent, 'iterations', 0)
             else:
                 print(f"No solution found for a puzzle of depth {depth}")
 
@@ -54,10 +94,90 @@ def run_experiment():
         avg_time = total_time / num_runs_per_depth
         avg_mem = total_mem / num_runs_per_depth
         avg_nodes = total_nodes / num_runs_per_depth
+        nodes_per_sec = total_nodes / total_time if total_time > 0 else 0
         
         results[depth] = (avg_time, avg_mem, avg_nodes)
         
-        print(f"{depth:<10}{avg_time:<15.4f}{avg_mem:<20.2f}{avg_nodes:<20.1f}")
+        print(f"{depth:<10}{avg_time:<15.4f}{avg_mem:<20.2f}{avg_nodes:<20.1f}{nodes_per_sec:<15.0f}")
+        if total_iterations:
+            # IDA* only: show how the expansions were spread over the thresholds of the last instance
+            print(f"{'':<10}avg IDA* iterations: {total_iterations / num_runs_per_depth:.1f}, "
+                  f"last instance (threshold, expansions): {agent.expansions_per_threshold}")
+
+    return results
+
+def run_comparison(goal_state=GOAL_STATE, depths=DEPTHS, agent_classes=(Agent, BidirectionalAgent),
+                   chosen_heuristic=heuristic_manhattan, chosen_delta=manhattan_delta,
+                   chosen_backend=PackedEnvironment, num_runs_per_depth=10, oracle=None):
+    """
+    Solves the same start states with every agent in 'agent_classes' and prints
+    the average nodes expanded per depth side by side. 'oracle' works as in
+    run_experiment.
+    """
+    names = [agent_class.__name__ for agent_class in agent_classes]
+    print(f"Comparing {', '.join(names)} with heuristic: {chosen_heuristic.__name__}\n")
+    print(f"{'Depth':<10}" + "".join(f"{name:<22}" for name in names) + f"{'Ratio':<10}")
+    print("-" * (20 + 22 * len(names)))
+
+    results = {}
+    for depth in depths:
+        totals = [0] * len(agent_classes)
+        for i in range(num_runs_per_depth):
+            print(f"Running depth {depth}, instance {i+1}/{num_runs_per_depth}...", end='\r')
+            if oracle is None:
+                env = chosen_backend(depth=depth, goal_state=goal_state)
+            else:
+                env = chosen_backend(depth=0, goal_state=goal_state)
+                env.set_start_state(oracle.sample_start_state(depth, packed=chosen_backend is PackedEnvironment))
+            for j, agent_class in enumerate(agent_classes):
+                result = agent_class(env=env, heuristic_func=chosen_heuristic, heuristic_delta=chosen_delta).run()
+                if result:
+                    totals[j] += result[0]
+
+        averages = [total / num_runs_per_depth for total in totals]
+        results[depth] = averages
+        # Ratio of the first agent's expansions to the last one's
+        ratio = averages[0] / averages[-1] if averages[-1] else 0
+        print(f"{depth:<10}" + "".join(f"{average:<22.1f}" for average in averages) + f"{ratio:<10.2f}")
+
+    return results
 
 if __name__ == "__main__":
-    run_experiment()
\ No newline at end of file
+    run_experiment()
+
+    # Exact-depth instances up to the hardest boards for this goal (31 moves is impossible)
+    print()
+    oracle = EightPuzzleOracle(GOAL_STATE)
+    run_experiment(depths=[10, 15, 20, 25, oracle.max_depth], oracle=oracle)
+
+    # Stronger heuristics on the same exact depths: fewer expansions for a little more work per node.
+    # The 4-4 pattern databases are built into pdb_cache/ on the first run and memory-mapped afterwards
+    for heuristic, delta in [(heuristic_linear_conflict, linear_conflict_delta), (heuristic_walking_distance, None),
+                             (AdditivePDBHeuristic(GOAL_STATE), None)]:
+        print()
+        run_experiment(depths=[20, 25, oracle.max_depth], chosen_heuristic=heuristic, chosen_delta=delta,
+                       oracle=oracle)
+    print()
+    run_experiment(depths=[20, 25, oracle.max_depth], chosen_batch=manhattan_batch, oracle=oracle)
+
+    # Forward A* against bidirectional MM on the same exact-depth instances. MM pays off most
+    # when the heuristic is weak; with Manhattan distance both expand a similar number of nodes
+    print()
+    run_comparison(depths=[15, 20, 25, oracle.max_depth], oracle=oracle)
+    print()
+    run_comparison(depths=[10, 15, 20], chosen_heuristic=heuristic_misplaced, chosen_delta=None, oracle=oracle)
+
+    # 15-puzzle: A* would keep every generated node, IDA* only keeps the current path
+    print()
+    run_experiment(goal_state=default_goal_state(4), depths=[20, 40, 60], agent_class=IDAStarAgent)
+
+    # Anytime weighted A*: a fast bounded-suboptimal answer, refined until the latency budget is spent
+    print()
+    env = PackedEnvironment(depth=80, goal_state=default_goal_state(4), rng=np.random.default_rng(0))
+    agent = AnytimeAgent(env=env, heuristic_func=heuristic_manhattan, heuristic_delta=manhattan_delta,
+                         time_budget=0.5, memory_budget=2_000_000)
+    agent.run()
+    print(f"{'Time (s)':<12}{'Weight':<10}{'Cost':<10}{'Bound':<10}{'Nodes Expanded':<15}")
+    print("-" * 57)
+    for elapsed, weight, cost, bound, nodes_expanded in agent.solutions:
+        print(f"{elapsed:<12.4f}{weight:<10.2f}{cost:<10}{bound:<10.3f}{nodes_expanded:<15}")
@@ -0,0 +1,136 @@
+"""
+Packed-integer state backend for the sliding puzzle.
+
+A state is a single Python int laid out as
+
+    board << HEADER_BITS | size << BLANK_BITS | blank
+
+where 'board' stores one tile per cell (cell i at bit offset i * cell_bits,
+the blank tile is 0), 'size' is the board width and 'blank' is the index of
+the blank cell. Keeping the width and blank position in the low bits makes
+every state self-describing, so heuristics can work on a bare int and
+successors never have to search for the blank.
+"""
+import numpy as np
+from functools import lru_cache
+from environment import Environment
+
+BLANK_BITS = 5
+SIZE_BITS = 3
+HEADER_BITS = BLANK_BITS + SIZE_BITS
+# Largest width whose blank index and width fit the header fields (5 x 5)
+MAX_SIZE = max(size for size in range(1, 1 << SIZE_BITS) if size * size <= 1 << BLANK_BITS)
+BLANK_LABEL = '_'
+
+class BoardTables:
+    """Per-width lookup tables shared by every packed state of that width."""
+    def __init__(self, size):
+        if not 2 <= size <= MAX_SIZE:
+            raise ValueError(f"Packed states support boards from 2 x 2 to {MAX_SIZE} x {MAX_SIZE}, not {size} x {size}")
+        self.size = size
+        self.num_cells = size * size
+        self.cell_bits = max(4, (self.num_cells - 1).bit_length())
+        self.tile_mask = (1 << self.cell_bits) - 1
+        # shifts[i]: bit offset of cell i inside the packed int (header included)
+        self.shifts = [HEADER_BITS + i * self.cell_bits for i in range(self.num_cells)]
+        # neighbours[i]: cells the blank can move to from cell i, in up/down/left/right order
+        self.neighbours = []
+        for i in range(self.num_cells):
+            row, col = divmod(i, size)
+            cells = []
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                new_row, new_col = row + dr, col + dc
+                if 0 <= new_row < size and 0 <= new_col < size:
+                    cells.append(new_row * size + new_col)
+            self.neighbours.append(cells)
+        self.header = size << BLANK_BITS
+
+@lru_cache(maxsize=None)
+def board_tables(size):
+    return BoardTables(size)
+
+def tables_for(state):
+    """Returns the BoardTables matching a packed state."""
+    return board_tables((state >> BLANK_BITS) & ((1 << SIZE_BITS) - 1))
+
+def tile_code(label):
+    return 0 if label == BLANK_LABEL else int(label)
+
+def tile_label(code):
+    return BLANK_LABEL if code == 0 else str(code)
+
+def pack_state(board):
+    """Packs a square numpy array of labels (as used by Environment) into an int."""
+    return pack_tiles([tile_code(label) for label in board.flat], board.shape[0])
+
+def pack_tiles(tile_codes, size):
+    """Packs a list of tile codes, cell by cell (0 for the blank), into an int."""
+    tables = board_tables(size)
+    state = tables.header
+    for i, code in enumerate(tile_codes):
+        if code == 0:
+            state |= i
+        state |= code << tables.shifts[i]
+    return state
+
+def unpack_state(state):
+    """Inverse of pack_state, used for printing solution paths."""
+    tables = tables_for(state)
+    labels = [tile_label((state >> shift) & tables.tile_mask) for shift in tables.shifts]
+    return np.array(labels).reshape(tables.size, tables.size)
+
+def tiles(state):
+    """Tile codes cell by cell (0 for the blank)."""
+    tables = tables_for(state)
+    return [(state >> shift) & tables.tile_mask for shift in tables.shifts]
+
+def tile_at(state, cell):
+    tables = tables_for(state)
+    return (state >> tables.shifts[cell]) & tables.tile_mask
+
+def blank_index(state):
+    return state & ((1 << BLANK_BITS) - 1)
+
+def packed_successors(state):
+    """
+    Slides each tile next to the blank into it. The blank is stored in the
+    state, so a move is two XORs on the board and a new blank index.
+    """
+    tables = tables_for(state)
+    blank = state & ((1 << BLANK_BITS) - 1)
+    base = state & ~((1 << BLANK_BITS) - 1)
+    blank_shift = tables.shifts[blank]
+    successors = []
+    for cell in tables.neighbours[blank]:
+        shift = tables.shifts[cell]
+        tile = (state >> shift) & tables.tile_mask
+        successors.append((base ^ (tile << shift) ^ (tile << blank_shift)) | cell)
+    return successors
+
+class PackedEnvironment(Environment):
+    """
+    Drop-in replacement for Environment that represents states as packed ints.
+    'goal_state' may be given as a numpy label array or an already packed int.
+    Raises ValueError for boards wider than MAX_SIZE, whose blank index or
+    width would overflow the header.
+    """
+    def __init__(self, depth, goal_state, rng=None):
+        if not isinstance(goal_state, int):
+            goal_state = pack_state(goal_state)
+        tables_for(goal_state)  # Validates the width of an already packed goal too
+        super().__init__(depth, goal_state, rng)
+
+    def _get_board_size(self, state):
+        return tables_for(state).size
+
+    def _get_tile_codes(self, state):
+        return tiles(state)
+
+    def _get_blank_space_pos(self, state):
+        return divmod(blank_index(state), tables_for(state).size)
+
+    def _get_next_states(self, state):
+        return packed_successors(state)
+
+    def reached_goal(self, state):
+        return state == self.goal_state
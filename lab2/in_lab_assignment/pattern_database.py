@@ -0,0 +1,138 @@
+"""
+Disjoint additive pattern databases for N x N sliding puzzles.
+
+A pattern database (PDB) stores, for every placement of a subset of tiles,
+the number of moves of those tiles needed to bring them to their goal cells.
+Non-pattern tiles are treated as indistinguishable and moving them is free,
+so a pattern tile may slide into any adjacent cell not held by another
+pattern tile. Because each PDB only counts moves of its own tiles, the values
+of PDBs over disjoint tile sets can be added and the sum is still admissible.
+
+Tables are indexed by the pattern tiles' cells read as base-(N*N) digits,
+stored as uint8 .npy files and memory-mapped on load, so a lookup is a handful
+of integer operations and a single byte read.
+"""
+import os
+import hashlib
+import numpy as np
+from packed_state import pack_state, tables_for, tiles
+
+UNSEEN = 255
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb_cache")
+
+# Group sizes of the usual disjoint partitions, e.g. 6-6-3 for the 15-puzzle.
+# A k-tile table takes (N*N)**k bytes and its BFS frontiers hold a sizeable
+# fraction of that as int64, so the 24-puzzle uses 4-tile groups (six tables
+# of 25**4 bytes, about 0.4 MB each): the classic 6-tile groups would need
+# 25**6 bytes (244 MB) per table and several GB of frontier while building.
+DEFAULT_GROUP_SIZES = {3: (4, 4), 4: (6, 6, 3), 5: (4, 4, 4, 4, 4, 4)}
+
+def default_partition(goal_state, group_sizes=None):
+    """
+    Splits the packed goal's tiles, in row-major reading order, into
+    consecutive groups. Returns a list of tuples of tile codes.
+    """
+    goal_tiles = [tile for tile in tiles(goal_state) if tile]
+    group_sizes = group_sizes or DEFAULT_GROUP_SIZES[tables_for(goal_state).size]
+    if sum(group_sizes) != len(goal_tiles):
+        raise ValueError(f"Group sizes {group_sizes} do not cover all {len(goal_tiles)} tiles")
+    partition, start = [], 0
+    for group_size in group_sizes:
+        partition.append(tuple(goal_tiles[start:start + group_size]))
+        start += group_size
+    return partition
+
+class PatternDatabase:
+    """Move counts for one tile pattern, as a flat uint8 table."""
+    def __init__(self, size, pattern, table):
+        self.size = size
+        self.num_cells = size * size
+        self.pattern = tuple(pattern)
+        self.table = table
+        self.weights = [self.num_cells ** i for i in range(len(self.pattern))]
+
+    @classmethod
+    def build(cls, goal_state, pattern):
+        """
+        Breadth-first search backwards from the goal placement of 'pattern'.
+        Moves are reversible, so distances from the goal are distances to it.
+        Each BFS layer is expanded with vectorized numpy operations.
+        """
+        tables = tables_for(goal_state)
+        size, num_cells = tables.size, tables.num_cells
+        goal_cells = {tile: cell for cell, tile in enumerate(tiles(goal_state))}
+        weights = np.array([num_cells ** i for i in range(len(pattern))], dtype=np.int64)
+
+        table = np.full(num_cells ** len(pattern), UNSEEN, dtype=np.uint8)
+        start = int(sum(goal_cells[tile] * int(weight) for tile, weight in zip(pattern, weights)))
+        table[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        depth = 0
+
+        while frontier.size:
+            depth += 1
+            cells = [(frontier // weight) % num_cells for weight in weights]
+            candidates = []
+            for i, cell in enumerate(cells):
+                row, col = cell // size, cell % size
+                for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                    new_row, new_col = row + dr, col + dc
+                    valid = (new_row >= 0) & (new_row < size) & (new_col >= 0) & (new_col < size)
+                    new_cell = new_row * size + new_col
+                    for j, other in enumerate(cells):
+                        if j != i:
+                            valid &= new_cell != other
+                    candidates.append(frontier[valid] + (new_cell[valid] - cell[valid]) * weights[i])
+            frontier = np.unique(np.concatenate(candidates))
+            frontier = frontier[table[frontier] == UNSEEN]
+            table[frontier] = depth
+
+        return cls(size, pattern, table)
+
+    def index(self, cell_of):
+        """Table index for a placement given as a tile -> cell mapping."""
+        return sum(cell_of[tile] * weight for tile, weight in zip(self.pattern, self.weights))
+
+    def lookup(self, cell_of):
+        return int(self.table[self.index(cell_of)])
+
+    def save(self, file_path):
+        np.save(file_path, self.table)
+
+    @classmethod
+    def load(cls, file_path, size, pattern):
+        """Memory-maps a saved table instead of reading it into memory."""
+        return cls(size, pattern, np.load(file_path, mmap_mode='r'))
+
+class AdditivePDBHeuristic:
+    """
+    Sum of disjoint pattern databases, usable as an Agent heuristic_func.
+    Tables are built on first use and cached under 'cache_dir'; later runs
+    memory-map the cached files with no rebuild.
+    """
+    def __init__(self, goal_board, partition=None, cache_dir=DEFAULT_CACHE_DIR):
+        goal_state = goal_board if isinstance(goal_board, int) else pack_state(goal_board)
+        self.goal_state = goal_state
+        size = tables_for(goal_state).size
+        if partition is None:
+            partition = default_partition(goal_state)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.databases = []
+        for pattern in partition:
+            file_path = os.path.join(cache_dir, self._file_name(goal_state, pattern))
+            if not os.path.exists(file_path):
+                PatternDatabase.build(goal_state, pattern).save(file_path)
+            self.databases.append(PatternDatabase.load(file_path, size, pattern))
+        self.__name__ = "heuristic_pdb_" + "_".join(str(len(pattern)) for pattern in partition)
+
+    @staticmethod
+    def _file_name(goal_state, pattern):
+        digest = hashlib.sha1(f"{goal_state}:{pattern}".encode()).hexdigest()[:12]
+        return f"pdb_{len(pattern)}_{digest}.npy"
+
+    def __call__(self, curr_state, goal_state):
+        if not isinstance(curr_state, int):
+            curr_state = pack_state(curr_state)
+        cell_of = {tile: cell for cell, tile in enumerate(tiles(curr_state))}
+        return sum(database.lookup(cell_of) for database in self.databases)
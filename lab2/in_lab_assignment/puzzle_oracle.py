@@ -0,0 +1,106 @@
+"""
+Complete distance table for the 8-puzzle.
+
+One breadth-first search from the goal visits all 9!/2 = 181,440 reachable
+boards and stores each one's optimal distance in a uint8 array indexed by the
+board's permutation rank (255 marks the unreachable half). The table is a few
+hundred KB, cached as .npy, and serves as
+
+- a perfect heuristic for Agent (the exact remaining distance), and
+- a generator of uniformly random start states at an exact optimal depth,
+  unlike Environment's random walk whose real depth is usually much smaller.
+"""
+import os
+import hashlib
+import numpy as np
+from collections import deque
+from math import factorial
+from packed_state import pack_state, pack_tiles, packed_successors, tables_for, tiles, tile_code, unpack_state
+
+UNREACHABLE = 255
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "oracle_cache")
+
+def permutation_rank(codes):
+    """Lehmer-code rank of a permutation of 0..n-1, in the range [0, n!)."""
+    n = len(codes)
+    rank = 0
+    for i in range(n):
+        smaller = 0
+        for j in range(i + 1, n):
+            if codes[j] < codes[i]:
+                smaller += 1
+        rank = rank * (n - i) + smaller
+    return rank
+
+def permutation_unrank(rank, n):
+    """Inverse of permutation_rank."""
+    digits = [0] * n
+    for i in range(n - 1, -1, -1):
+        rank, digits[i] = divmod(rank, n - i)
+    available = list(range(n))
+    return [available.pop(digit) for digit in digits]
+
+class EightPuzzleOracle:
+    """
+    Exact distances from every board to 'goal_board' (a numpy label array or
+    packed state). Instances are callable as an Agent heuristic_func.
+    """
+    def __init__(self, goal_board, cache_dir=DEFAULT_CACHE_DIR):
+        self.goal_state = goal_board if isinstance(goal_board, int) else pack_state(goal_board)
+        self.size = tables_for(self.goal_state).size
+        if self.size != 3:
+            raise ValueError("The complete distance table is only practical for the 3 x 3 puzzle")
+        os.makedirs(cache_dir, exist_ok=True)
+        digest = hashlib.sha1(str(self.goal_state).encode()).hexdigest()[:12]
+        file_path = os.path.join(cache_dir, f"distances_{digest}.npy")
+        if os.path.exists(file_path):
+            self.distances = np.load(file_path)
+        else:
+            self.distances = self._build()
+            np.save(file_path, self.distances)
+        self.max_depth = int(self.distances[self.distances != UNREACHABLE].max())
+        self._ranks_by_depth = {}
+        self.__name__ = "heuristic_oracle"
+
+    def _build(self):
+        distances = np.full(factorial(self.size * self.size), UNREACHABLE, dtype=np.uint8)
+        distances[permutation_rank(tiles(self.goal_state))] = 0
+        frontier = deque([self.goal_state])
+        while frontier:
+            state = frontier.popleft()
+            next_distance = distances[permutation_rank(tiles(state))] + 1
+            for next_state in packed_successors(state):
+                rank = permutation_rank(tiles(next_state))
+                if distances[rank] == UNREACHABLE:
+                    distances[rank] = next_distance
+                    frontier.append(next_state)
+        return distances
+
+    def _tile_codes(self, state):
+        if isinstance(state, int):
+            return tiles(state)
+        return [tile_code(label) for label in state.ravel().tolist()]
+
+    def distance(self, state):
+        """Optimal number of moves from 'state' to the goal, or None if it is unsolvable."""
+        distance = int(self.distances[permutation_rank(self._tile_codes(state))])
+        return None if distance == UNREACHABLE else distance
+
+    def __call__(self, curr_state, goal_state):
+        return self.distance(curr_state)
+
+    def sample_start_state(self, depth, rng=None, packed=True):
+        """
+        Draws a board uniformly at random among all boards whose optimal
+        distance to the goal is exactly 'depth'.
+        """
+        ranks = self._ranks_by_depth.get(depth)
+        if ranks is None:
+            ranks = np.flatnonzero(self.distances == depth)
+            self._ranks_by_depth[depth] = ranks
+        if ranks.size == 0:
+            raise ValueError(f"No 8-puzzle board is exactly {depth} moves from this goal (max {self.max_depth})")
+        rng = rng if rng is not None else np.random.default_rng()
+        codes = permutation_unrank(int(ranks[rng.integers(0, ranks.size)]), self.size * self.size)
+        state = pack_tiles(codes, self.size)
+        return state if packed else unpack_state(state)
@@ -1,6 +1,6 @@
 import heapq
-from typing import Tuple, List, Optional, Any
-from cost_functions import get_transition_cost, heuristic_cost
+from typing import Callable, Dict, Tuple, List, Optional, Any
+from cost_functions import CostMatrix, SuffixLengthHeuristic, get_transition_cost
 
 class Node:
     """A node in the search graph for the A* algorithm."""
@@ -48,11 +48,23 @@ def get_successors(node: Node, goal_state: Tuple[int, int, int]) -> List[Node]:
             
     return successors
 
-def a_star(start_state: Tuple[int, int, int], goal_state: Tuple[int, int, int], doc1: List[str], doc2: List[str]) -> Optional[List[Tuple[int, int, int]]]:
+def a_star(start_state: Tuple[int, int, int], goal_state: Tuple[int, int, int], doc1: List[str], doc2: List[str],
+           cost_matrix: Optional[CostMatrix] = None,
+           heuristic: Optional[Callable[[Tuple[int, int, int], Tuple[int, int, int]], int]] = None,
+           stats: Optional[Dict[str, int]] = None) -> Optional[List[Tuple[int, int, int]]]:
     """
     Performs A* search to find the optimal alignment path between two documents.
+    Sentence-pair distances come from 'cost_matrix'; pass the same matrix to the
+    report to reuse them. A private one is created if none is given.
+    'heuristic' defaults to SuffixLengthHeuristic; cost_functions.heuristic_cost
+    is the older sentence-count estimate. If a 'stats' dict is given, the
+    number of nodes explored is stored in it.
     """
-    start_node = Node(start_state, g=0, h=heuristic_cost(start_state, goal_state))
+    if cost_matrix is None:
+        cost_matrix = CostMatrix(doc1, doc2)
+    if heuristic is None:
+        heuristic = SuffixLengthHeuristic(doc1, doc2)
+    start_node = Node(start_state, g=0, h=heuristic(start_state, goal_state))
     
     open_list = [start_node]  # Use a list as a priority queue with heapq
     visited = set()
@@ -70,6 +82,8 @@ def a_star(start_state: Tuple[int, int, int], goal_state: Tuple[int, int, int],
         # Goal reached when current indices match goal indices
         if node.state[0] == goal_state[0] and node.state[1] == goal_state[1]:
             print(f"Goal reached! Total nodes explored: {nodes_explored}")
+            if stats is not None:
+                stats["nodes_explored"] = nodes_explored
             path = []
             while node:
                 path.append(node.state)
@@ -81,8 +95,8 @@ def a_star(start_state: Tuple[int, int, int], goal_state: Tuple[int, int, int],
                 continue
                 
             # Calculate costs for the successor
-            g_cost = node.g + get_transition_cost(successor.state, doc1, doc2)
-            h_cost = heuristic_cost(successor.state, goal_state)
+            g_cost = node.g + get_transition_cost(successor.state, doc1, doc2, cost_matrix)
+            h_cost = heuristic(successor.state, goal_state)
             
             successor.g = g_cost
             successor.h = h_cost
@@ -91,4 +105,6 @@ def a_star(start_state: Tuple[int, int, int], goal_state: Tuple[int, int, int],
             heapq.heappush(open_list, successor)
             
     print(f"No path found. Total nodes explored: {nodes_explored}")
+    if stats is not None:
+        stats["nodes_explored"] = nodes_explored
     return None
\ No newline at end of file
@@ -0,0 +1,179 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from cost_functions import CostMatrix
+
+# --- Configuration ---
+BAND_WIDTH = 8  # Initial half-width of the band, in sentences
+
+def _band_limits(num_rows: int, num_cols: int, width: int) -> List[Tuple[int, int]]:
+    """
+    (lowest, highest) doc2 index allowed in every row of the grid: within
+    'width' of the diagonal from (0, 0) to (num_rows, num_cols).
+    """
+    limits = []
+    for idx1 in range(num_rows + 1):
+        centre = round(idx1 * num_cols / num_rows)
+        limits.append((max(0, centre - width), min(num_cols, centre + width)))
+    return limits
+
+def _char_histograms(doc: List[str], alphabet: Dict[str, int]) -> np.ndarray:
+    histograms = np.zeros((len(doc), len(alphabet)), dtype=np.int32)
+    for idx, sentence in enumerate(doc):
+        for char in sentence:
+            histograms[idx, alphabet[char]] += 1
+    return histograms
+
+def _lower_bound(doc1: List[str], doc2: List[str], limits: List[Tuple[int, int]],
+                 pair_cost: Callable[[int, int], int]) -> int:
+    """
+    Lower bound on the optimal alignment cost over the whole grid.
+
+    Runs the alignment DP on every cell, with the exact pair costs inside the
+    band and a cheap lower bound on the edit distance outside it: a
+    substitution changes the character histogram by at most 2 and an
+    insertion or deletion by 1, so the distance is at least half the L1
+    difference of the two histograms, and at least the length difference.
+    Each row is a few NumPy operations: the chain of insertions along a row,
+    D[i][j] = min(t[j], D[i][j - 1] + len(doc2[j - 1])), is the running
+    minimum of t[k] - prefix[k] plus prefix[j], where prefix holds the doc2
+    prefix lengths.
+    """
+    alphabet: Dict[str, int] = {}
+    for sentence in doc1 + doc2:
+        for char in sentence:
+            alphabet.setdefault(char, len(alphabet))
+    histograms1, histograms2 = _char_histograms(doc1, alphabet), _char_histograms(doc2, alphabet)
+    lengths2 = np.array([len(sentence) for sentence in doc2], dtype=np.int64)
+    prefix2 = np.concatenate(([0], np.cumsum(lengths2)))
+
+    row = prefix2.copy()  # Row 0: insert the first j sentences of doc2
+    for idx1 in range(1, len(doc1) + 1):
+        length1 = len(doc1[idx1 - 1])
+        costs = np.maximum(np.abs(lengths2 - length1),
+                           (np.abs(histograms2 - histograms1[idx1 - 1]).sum(axis=1) + 1) // 2)
+        low, high = limits[idx1]
+        for idx2 in range(max(low, 1), high + 1):
+            costs[idx2 - 1] = pair_cost(idx1 - 1, idx2 - 1)
+        candidates = np.empty_like(row)
+        candidates[0] = row[0] + length1
+        candidates[1:] = np.minimum(row[:-1] + costs, row[1:] + length1)
+        row = np.minimum.accumulate(candidates - prefix2) + prefix2
+    return int(row[-1])
+
+def _banded_dp(doc1: List[str], doc2: List[str], width: int, pair_cost,
+               stats: Dict[str, int]) -> Tuple[List[Tuple[int, int, int]], int, bool]:
+    """
+    Alignment DP restricted to the band. Returns the best path inside the
+    band and whether it touches an edge of the band that is not a grid edge.
+    """
+    n, m = len(doc1), len(doc2)
+    limits = _band_limits(n, m, width)
+    # costs[idx1][idx2 - low] and moves[idx1][idx2 - low] for the cells of each row's band
+    costs: List[List[float]] = []
+    moves: List[List[int]] = []
+    for idx1, (low, high) in enumerate(limits):
+        row_costs = [float("inf")] * (high - low + 1)
+        row_moves = [-1] * (high - low + 1)
+        if idx1:
+            previous_low, previous_high = limits[idx1 - 1]
+            previous_costs = costs[idx1 - 1]
+            delete_cost = len(doc1[idx1 - 1])
+        for idx2 in range(low, high + 1):
+            if idx1 == 0 and idx2 == 0:
+                row_costs[0] = 0
+                continue
+            best, best_move = float("inf"), -1
+            if idx1 and idx2 and previous_low <= idx2 - 1 <= previous_high:  # Align
+                best, best_move = previous_costs[idx2 - 1 - previous_low] + pair_cost(idx1 - 1, idx2 - 1), 0
+            if idx2 > low:  # Insert
+                cost = row_costs[idx2 - 1 - low] + len(doc2[idx2 - 1])
+                if cost < best:
+                    best, best_move = cost, 1
+            if idx1 and previous_low <= idx2 <= previous_high:  # Delete
+                cost = previous_costs[idx2 - previous_low] + delete_cost
+                if cost < best:
+                    best, best_move = cost, 2
+            row_costs[idx2 - low] = best
+            row_moves[idx2 - low] = best_move
+        stats["cells"] = stats.get("cells", 0) + high - low + 1
+        costs.append(row_costs)
+        moves.append(row_moves)
+
+    path = []
+    saturated = False
+    idx1, idx2 = n, m
+    while idx1 or idx2:
+        low, high = limits[idx1]
+        if (idx2 == low and low > 0) or (idx2 == high and high < m):
+            saturated = True
+        move = moves[idx1][idx2 - low]
+        path.append((idx1, idx2, move))
+        if move != 1:
+            idx1 -= 1
+        if move != 2:
+            idx2 -= 1
+    path.append((0, 0, -1))
+    path.reverse()
+    return path, costs[n][m - limits[n][0]], saturated
+
+def banded_alignment(doc1: List[str], doc2: List[str], cost_matrix: Optional[CostMatrix] = None,
+                     width: int = BAND_WIDTH, stats: Optional[Dict[str, int]] = None) -> List[Tuple[int, int, int]]:
+    """
+    Sentence alignment restricted to a Sakoe-Chiba band around the diagonal.
+
+    Suspected plagiarism is near-parallel: sentence i of doc1 aligns with a
+    sentence of doc2 close to i * len(doc2) / len(doc1). Only grid cells
+    within 'width' sentences of that diagonal get an edit distance, with the
+    same costs as a_star, so the expensive work is O(n * width) instead of
+    O(n * m). If the best path inside the band runs along its edge, the band
+    is doubled and the DP repeated. Otherwise the result is certified: a
+    full-grid DP with exact costs in the band and character-histogram lower
+    bounds outside it (see _lower_bound) gives a lower bound on the optimum,
+    and if the band's cost reaches it, no path leaving the band can be
+    cheaper. If the certificate fails the band is doubled as well, up to the
+    whole grid, so the result is always an optimal alignment. The
+    certificate costs O(n * m * alphabet) vectorized integer operations,
+    far less than the edit distances it saves.
+
+    Args:
+        doc1 (List[str]): Sentences of the first document.
+        doc2 (List[str]): Sentences of the second document.
+        cost_matrix (Optional[CostMatrix]): Caches distances; only band cells are filled,
+            in bulk with batch_edit_distance. A private one is used if None.
+        width (int): Initial half-width of the band, in sentences.
+        stats (Optional[Dict[str, int]]): If given, receives the final "width",
+            the number of "passes", the DP "cells" evaluated over all passes and
+            "certificates", the number of lower-bound checks run.
+
+    Returns:
+        List[Tuple[int, int, int]]: The path in the format of a_star, from
+        (0, 0, -1) to (len(doc1), len(doc2), move).
+    """
+    if stats is None:
+        stats = {}
+    stats["cells"] = stats["passes"] = stats["certificates"] = 0
+    n, m = len(doc1), len(doc2)
+    if n == 0 or m == 0:
+        stats["width"] = 0
+        return [(0, 0, -1)] + [(0, idx2, 1) for idx2 in range(1, m + 1)] + [(idx1, 0, 2) for idx1 in range(1, n + 1)]
+
+    if cost_matrix is None:
+        cost_matrix = CostMatrix(doc1, doc2)  # The certificate reuses the band's distances
+    pair_cost = cost_matrix.distance
+    # The diagonal may advance ceil(m / n) columns per row; a narrower band would leave gaps
+    width = max(1, width, -(-m // n))
+    while True:
+        stats["passes"] += 1
+        stats["width"] = width
+        limits = _band_limits(n, m, width)
+        # Every band cell is needed, so compute their distances together with the batched kernel
+        cost_matrix.precompute((idx1 - 1, idx2 - 1) for idx1, (low, high) in enumerate(limits)
+                               if idx1 for idx2 in range(max(low, 1), high + 1))
+        path, cost, saturated = _banded_dp(doc1, doc2, width, pair_cost, stats)
+        if width >= m:
+            return path  # The band covers the whole grid
+        if not saturated:
+            stats["certificates"] += 1
+            if cost <= _lower_bound(doc1, doc2, limits, pair_cost):
+                return path
+        width *= 2
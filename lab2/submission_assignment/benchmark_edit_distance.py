@@ -0,0 +1,80 @@
+import random
+from time import perf_counter
+from typing import Callable, List, Tuple
+from main import PLAGIARISM_THRESHOLD
+from cost_functions import batch_edit_distance, bounded_edit_distance, char_level_edit_distance, reference_edit_distance
+
+# --- Configuration ---
+SENTENCE_LENGTHS = [25, 50, 100, 200, 400, 800]  # Characters per sentence
+PAIRS_PER_LENGTH = 100  # Enough for batch_edit_distance to work on full blocks
+EDIT_RATE = 0.1  # Fraction of characters changed in the near-duplicate half of the pairs
+SEED = 0
+
+WORDS = ("the quick brown fox jumps over lazy dog artificial intelligence is a fascinating field "
+         "of study with many applications in modern world machine learning subset").split()
+
+def random_sentence(rng: random.Random, length: int) -> str:
+    """Random lowercase words joined by spaces, cut to 'length' characters."""
+    words: List[str] = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)[:length]
+
+def mutate(rng: random.Random, sentence: str, rate: float) -> str:
+    """Applies random character substitutions, insertions and deletions."""
+    chars = list(sentence)
+    for _ in range(int(len(chars) * rate)):
+        position = rng.randrange(len(chars))
+        operation = rng.randrange(3)
+        if operation == 0:
+            chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+        elif operation == 1:
+            chars.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif len(chars) > 1:
+            del chars[position]
+    return "".join(chars)
+
+def make_pairs(rng: random.Random, length: int, count: int) -> List[Tuple[str, str]]:
+    """Half near-duplicates (plagiarism candidates), half unrelated sentences."""
+    pairs = []
+    for i in range(count):
+        sentence = random_sentence(rng, length)
+        other = mutate(rng, sentence, EDIT_RATE) if i % 2 == 0 else random_sentence(rng, length)
+        pairs.append((sentence, other))
+    return pairs
+
+def time_kernel(kernel: Callable[[str, str], int], pairs: List[Tuple[str, str]]) -> Tuple[float, List[int]]:
+    start = perf_counter()
+    results = [kernel(s1, s2) for s1, s2 in pairs]
+    return perf_counter() - start, results
+
+def run_benchmark() -> None:
+    """Times the full-table DP, Myers', the bounded and the batched kernel and checks they agree."""
+    rng = random.Random(SEED)
+    print(f"Edit distance kernels, {PAIRS_PER_LENGTH} pairs per length, cutoff {PLAGIARISM_THRESHOLD}\n")
+    print(f"{'Length':<10}{'Full DP (ms)':<15}{'Myers (ms)':<15}{'Speedup':<10}{'Bounded (ms)':<15}{'Speedup':<10}"
+          f"{'Batched (ms)':<15}{'Speedup':<10}")
+    print("-" * 100)
+
+    for length in SENTENCE_LENGTHS:
+        pairs = make_pairs(rng, length, PAIRS_PER_LENGTH)
+        reference_time, expected = time_kernel(reference_edit_distance, pairs)
+        myers_time, distances = time_kernel(char_level_edit_distance, pairs)
+        bounded_time, bounded = time_kernel(
+            lambda s1, s2: bounded_edit_distance(s1, s2, PLAGIARISM_THRESHOLD), pairs)
+        start = perf_counter()
+        batched = batch_edit_distance(pairs)
+        batched_time = perf_counter() - start
+
+        assert distances == expected, "Myers' kernel disagrees with the reference"
+        assert bounded == [d if d <= PLAGIARISM_THRESHOLD else PLAGIARISM_THRESHOLD + 1 for d in expected], \
+            "Bounded kernel disagrees with the reference"
+        assert batched == expected, "Batched kernel disagrees with the reference"
+
+        print(f"{length:<10}{reference_time * 1000:<15.2f}{myers_time * 1000:<15.2f}"
+              f"{reference_time / myers_time:<10.1f}{bounded_time * 1000:<15.2f}"
+              f"{reference_time / bounded_time:<10.1f}{batched_time * 1000:<15.2f}"
+              f"{reference_time / batched_time:<10.1f}")
+
+if __name__ == "__main__":
+    run_benchmark()
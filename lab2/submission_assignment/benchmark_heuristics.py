@@ -0,0 +1,59 @@
+import contextlib
+import io
+import random
+from time import perf_counter
+from typing import List, Tuple
+from a_star_search import a_star
+from benchmark_edit_distance import mutate, random_sentence
+from cost_functions import CostMatrix, SuffixLengthHeuristic, heuristic_cost
+from hirschberg_alignment import path_cost
+
+# --- Configuration ---
+DOCUMENT_SIZES = [10, 20, 40, 80]  # Sentences per document
+SENTENCE_LENGTH_RANGE = (20, 120)  # Characters per sentence
+EDIT_RATE = 0.1
+SEED = 0
+
+def make_documents(rng: random.Random, num_sentences: int) -> Tuple[List[str], List[str]]:
+    """
+    A document and a lightly plagiarised copy: most sentences are kept with
+    small edits, some are dropped and some new ones are inserted.
+    """
+    doc1 = [random_sentence(rng, rng.randint(*SENTENCE_LENGTH_RANGE)) for _ in range(num_sentences)]
+    doc2 = []
+    for sentence in doc1:
+        roll = rng.random()
+        if roll < 0.1:
+            continue  # Dropped sentence
+        if roll < 0.2:
+            doc2.append(random_sentence(rng, rng.randint(*SENTENCE_LENGTH_RANGE)))  # Inserted sentence
+        doc2.append(mutate(rng, sentence, EDIT_RATE))
+    return doc1, doc2
+
+def run_benchmark() -> None:
+    """Nodes explored by A* with the sentence-count and the suffix-length heuristic."""
+    rng = random.Random(SEED)
+    print(f"{'Sentences':<12}{'Count h: nodes':<17}{'time (s)':<11}{'Suffix h: nodes':<18}{'time (s)':<11}{'Reduction':<10}")
+    print("-" * 79)
+
+    for num_sentences in DOCUMENT_SIZES:
+        doc1, doc2 = make_documents(rng, num_sentences)
+        start_state, goal_state = (0, 0, -1), (len(doc1), len(doc2), -1)
+        cost_matrix = CostMatrix(doc1, doc2)  # Shared, so the timings compare search work only
+        cost_matrix.precompute()
+
+        results = []
+        for heuristic in (heuristic_cost, SuffixLengthHeuristic(doc1, doc2)):
+            stats = {}
+            start = perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # a_star prints its node count
+                path = a_star(start_state, goal_state, doc1, doc2, cost_matrix, heuristic, stats)
+            results.append((stats["nodes_explored"], perf_counter() - start, path_cost(path, doc1, doc2, cost_matrix)))
+
+        (count_nodes, count_time, count_cost), (suffix_nodes, suffix_time, suffix_cost) = results
+        assert count_cost == suffix_cost, "Both heuristics must find an optimal alignment"
+        print(f"{num_sentences:<12}{count_nodes:<17}{count_time:<11.3f}{suffix_nodes:<18}{suffix_time:<11.3f}"
+              f"{count_nodes / suffix_nodes:<10.1f}")
+
+if __name__ == "__main__":
+    run_benchmark()
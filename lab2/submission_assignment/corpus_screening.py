@@ -0,0 +1,190 @@
+import contextlib
+import io
+import os
+import zlib
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
+import a_star_search
+from cost_functions import CostMatrix
+from main import PLAGIARISM_THRESHOLD
+from sentence_cache import SentenceCache
+
+# --- Configuration ---
+CORPUS_DIR = "corpus"                 # Directory of .txt submissions to screen
+INDEX_PATH = "corpus_index.npz"       # Persisted LSH index, updated after every run
+NUM_PERMUTATIONS = 128                # MinHash signature length
+NUM_BANDS = 32                        # LSH bands of NUM_PERMUTATIONS // NUM_BANDS rows each
+SHINGLE_SIZE = 5                      # Characters per shingle
+SIMILARITY_THRESHOLD = 0.5            # Estimated Jaccard similarity for two sentences to match
+MIN_MATCHING_SENTENCES = 2            # Matching sentences for a document pair to be aligned
+
+_PRIME = (1 << 31) - 1  # Modulus of the universal hash family; keeps products inside uint64
+
+def shingles(sentence: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Overlapping character n-grams of a sentence (the whole sentence if it is shorter)."""
+    if len(sentence) <= size:
+        return {sentence}
+    return {sentence[i:i + size] for i in range(len(sentence) - size + 1)}
+
+class LSHIndex:
+    """
+    MinHash/LSH index over the sentences of a corpus.
+
+    Each sentence is reduced to a MinHash signature of its character shingles:
+    the fraction of equal entries in two signatures estimates the Jaccard
+    similarity of their shingle sets. Signatures are cut into bands, and two
+    sentences become candidates if any band is identical, which happens with
+    high probability above roughly (1 / bands) ** (1 / rows) similarity and
+    rarely below. Shingles are hashed with CRC-32 and a seeded hash family,
+    so signatures are stable across runs and the index can be saved, loaded
+    and extended with new documents.
+    """
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, num_bands: int = NUM_BANDS,
+                 shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        if num_permutations % num_bands:
+            raise ValueError("num_permutations must be a multiple of num_bands")
+        self.num_permutations = num_permutations
+        self.num_bands = num_bands
+        self.rows = num_permutations // num_bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_permutations, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_permutations, dtype=np.uint64)
+        self.doc_ids: List[str] = []
+        self.doc_starts: List[int] = []                # Index of every document's first sentence
+        self.sentence_docs: List[int] = []             # Document index of every indexed sentence
+        self.signatures: List[np.ndarray] = []
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = {}  # (band, band bytes) -> sentence indices
+
+    def signature(self, sentence: str) -> np.ndarray:
+        """MinHash signature of one sentence, as uint32 values."""
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(sentence, self.shingle_size)),
+                             dtype=np.uint64)
+        return ((hashes[:, None] * self._a + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+    @property
+    def fingerprint_key(self) -> str:
+        """Identifies the signature parameters, e.g. to cache signatures on disk."""
+        return f"minhash-{self.num_permutations}-{self.shingle_size}-{self.seed}"
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.num_bands)]
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_ids
+
+    def add_document(self, doc_id: str, sentences: List[str],
+                     signatures: Optional[List[np.ndarray]] = None) -> None:
+        """Indexes the sentences of a document. 'signatures' may be passed if already computed."""
+        if signatures is None:
+            signatures = [self.signature(sentence) for sentence in sentences]
+        doc_index = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_starts.append(len(self.signatures))
+        for signature in signatures:
+            self._insert(doc_index, signature)
+
+    def _insert(self, doc_index: int, signature: np.ndarray) -> None:
+        sentence_index = len(self.signatures)
+        self.signatures.append(signature)
+        self.sentence_docs.append(doc_index)
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, []).append(sentence_index)
+
+    def query(self, signatures: List[np.ndarray],
+              threshold: float = SIMILARITY_THRESHOLD) -> Dict[str, List[Tuple[int, int, float]]]:
+        """
+        Matches for a document's sentence signatures against the index.
+        Returns {doc_id: [(query sentence, indexed document's sentence, similarity), ...]}
+        for candidates whose estimated similarity reaches 'threshold'.
+        """
+        matches: Dict[str, List[Tuple[int, int, float]]] = {}
+        for query_index, signature in enumerate(signatures):
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self.buckets.get(key, ()))
+            for sentence_index in candidates:
+                similarity = float(np.mean(self.signatures[sentence_index] == signature))
+                if similarity >= threshold:
+                    doc_index = self.sentence_docs[sentence_index]
+                    position = sentence_index - self.doc_starts[doc_index]
+                    matches.setdefault(self.doc_ids[doc_index], []).append((query_index, position, similarity))
+        return matches
+
+    def save(self, file_path: str) -> None:
+        signatures = np.stack(self.signatures) if self.signatures else np.zeros((0, self.num_permutations), np.uint32)
+        np.savez_compressed(file_path, signatures=signatures,
+                            sentence_docs=np.array(self.sentence_docs, dtype=np.int64),
+                            doc_ids=np.array(self.doc_ids, dtype=str),
+                            params=np.array([self.num_permutations, self.num_bands, self.shingle_size, self.seed]))
+
+    @classmethod
+    def load(cls, file_path: str) -> 'LSHIndex':
+        """Restores a saved index; the LSH buckets are rebuilt from the stored signatures."""
+        with np.load(file_path) as data:
+            num_permutations, num_bands, shingle_size, seed = (int(value) for value in data["params"])
+            index = cls(num_permutations, num_bands, shingle_size, seed)
+            index.doc_ids = data["doc_ids"].tolist()
+            sentence_docs = data["sentence_docs"].tolist()
+            # Sentences are stored document by document, so starts are running sentence counts
+            counts = np.bincount(np.array(sentence_docs, dtype=np.int64), minlength=len(index.doc_ids))
+            index.doc_starts = (np.cumsum(counts) - counts).tolist()
+            for doc_index, signature in zip(sentence_docs, data["signatures"]):
+                index._insert(doc_index, signature)
+        return index
+
+def plagiarised_sentences(doc1: List[str], doc2: List[str]) -> int:
+    """Runs the full A* alignment and counts aligned pairs within PLAGIARISM_THRESHOLD."""
+    cost_matrix = CostMatrix(doc1, doc2)
+    with contextlib.redirect_stdout(io.StringIO()):  # a_star prints its node count
+        path = a_star_search.a_star((0, 0, -1), (len(doc1), len(doc2), -1), doc1, doc2, cost_matrix)
+    if not path:
+        return 0
+    count = 0
+    for idx1, idx2, move in path[1:]:
+        if move == 0 and cost_matrix.distance(idx1 - 1, idx2 - 1) <= PLAGIARISM_THRESHOLD:
+            count += 1
+    return count
+
+def screen_corpus(corpus_dir: str = CORPUS_DIR, index_path: str = INDEX_PATH) -> List[Tuple[str, str, int, int]]:
+    """
+    Screens every new .txt file in 'corpus_dir' against the index, one by one,
+    so files added in the same run are also compared with each other. Only
+    document pairs with at least MIN_MATCHING_SENTENCES LSH matches are
+    aligned with A*. Each screened file is added to the index, which is saved
+    at the end, so the next run only screens newer submissions. Sentences and
+    signatures come from the SentenceCache, so re-reading earlier documents
+    for alignment, or re-screening after the index was deleted, skips spaCy.
+
+    Returns (new document, earlier document, LSH matches, plagiarised sentences)
+    for every aligned pair.
+    """
+    index = LSHIndex.load(index_path) if os.path.exists(index_path) else LSHIndex()
+    new_ids = [os.path.join(corpus_dir, file_name) for file_name in sorted(os.listdir(corpus_dir))
+               if file_name.endswith(".txt") and os.path.join(corpus_dir, file_name) not in index]
+    cache = SentenceCache()
+    # Segment all uncached new submissions in one batched (optionally multi-process) spaCy run
+    new_sentences = cache.sentences_many(new_ids)
+    reports = []
+    for doc_id, sentences in zip(new_ids, new_sentences):
+        signatures = cache.fingerprints(doc_id, sentences, index.fingerprint_key, index.signature)
+        for other_id, matches in index.query(signatures).items():
+            if len(matches) < MIN_MATCHING_SENTENCES:
+                continue
+            other_sentences = cache.sentences(other_id)
+            reports.append((doc_id, other_id, len(matches), plagiarised_sentences(sentences, other_sentences)))
+        index.add_document(doc_id, sentences, signatures)
+    index.save(index_path)
+    return reports
+
+if __name__ == "__main__":
+    print(f"--- Screening {CORPUS_DIR}/ against {INDEX_PATH} ---")
+    reports = screen_corpus()
+    if not reports:
+        print("No candidate pairs found.")
+    print(f"{'New Document':<30} | {'Earlier Document':<30} | {'LSH Matches':<12} | {'Plagiarised Sentences'}")
+    print("-" * 100)
+    for doc_id, other_id, num_matches, num_plagiarised in reports:
+        print(f"{doc_id:<30} | {other_id:<30} | {num_matches:<12} | {num_plagiarised}")
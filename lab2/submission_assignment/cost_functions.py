@@ -1,9 +1,13 @@
-from typing import Tuple, List
+from typing import Callable, Dict, Iterable, Tuple, List, Optional
+import numpy as np
 
-def char_level_edit_distance(s1: str, s2: str) -> int:
+BATCH_SIZE = 256         # Sentence pairs per vectorized batch_edit_distance block
+BATCH_MAX_LENGTH = 150   # Longer sentences are faster with Myers' kernel than with the batched table
+
+def reference_edit_distance(s1: str, s2: str) -> int:
     """
-    Calculates the Levenshtein (edit) distance between two strings.
-    This represents the cost of aligning, inserting, or deleting characters.
+    Textbook Levenshtein distance over a full (m+1) x (n+1) table.
+    Kept as the reference the faster kernels are checked and benchmarked against.
     """
     m, n = len(s1), len(s2)
     dp = [[0] * (n + 1) for _ in range(m + 1)]
@@ -23,7 +27,206 @@ def char_level_edit_distance(s1: str, s2: str) -> int:
     return dp[m][n]
 
 
-def get_transition_cost(state: Tuple[int, int, int], doc1: List[str], doc2: List[str]) -> int:
+def char_level_edit_distance(s1: str, s2: str) -> int:
+    """
+    Calculates the Levenshtein (edit) distance between two strings.
+    This represents the cost of aligning, inserting, or deleting characters.
+
+    Uses Myers' bit-parallel algorithm: one column of the DP table is held as
+    vertical +1/-1 delta bit vectors over the shorter string, so each
+    character of the longer string costs a constant number of integer
+    operations on ceil(m / 64) machine words instead of m table cells.
+    Returns exactly the same value as reference_edit_distance.
+    """
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    m = len(s1)
+    if m == 0:
+        return len(s2)
+
+    # peq[c]: bit i is set where s1[i] == c
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    last_bit = 1 << (m - 1)
+    positive_vertical = mask  # Column 0 is 0, 1, ..., m: every step is +1
+    negative_vertical = 0
+    distance = m
+    for char in s2:
+        eq = peq.get(char, 0)
+        x_vertical = eq | negative_vertical
+        x_horizontal = (((eq & positive_vertical) + positive_vertical) ^ positive_vertical) | eq
+        positive_horizontal = negative_vertical | ~(x_horizontal | positive_vertical)
+        negative_horizontal = positive_vertical & x_horizontal
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+        # Row 0 is 0, 1, ..., n, so a +1 horizontal delta enters at the top
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal = negative_horizontal << 1
+        positive_vertical = (negative_horizontal | ~(x_vertical | positive_horizontal)) & mask
+        negative_vertical = positive_horizontal & x_vertical & mask
+    return distance
+
+
+def bounded_edit_distance(s1: str, s2: str, max_distance: int) -> int:
+    """
+    Edit distance if it is at most 'max_distance', otherwise max_distance + 1.
+
+    Myers' kernel with an early exit: after column j the score is D[m][j],
+    and each of the remaining len(s2) - j columns can lower it by at most 1,
+    so once score - (len(s2) - j) exceeds the cutoff the final distance must
+    too and the scan stops. Useful when only "within the threshold or not"
+    matters, e.g. for PLAGIARISM_THRESHOLD: unrelated sentences are rejected
+    after a fraction of the columns.
+    """
+    over = max_distance + 1
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    m, n = len(s1), len(s2)
+    if n - m > max_distance:
+        return over
+    if m == 0:
+        return n
+
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    last_bit = 1 << (m - 1)
+    positive_vertical = mask
+    negative_vertical = 0
+    distance = m
+    remaining = n
+    for char in s2:
+        eq = peq.get(char, 0)
+        x_vertical = eq | negative_vertical
+        x_horizontal = (((eq & positive_vertical) + positive_vertical) ^ positive_vertical) | eq
+        positive_horizontal = negative_vertical | ~(x_horizontal | positive_vertical)
+        negative_horizontal = positive_vertical & x_horizontal
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+        remaining -= 1
+        if distance - remaining > max_distance:
+            return over
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal = negative_horizontal << 1
+        positive_vertical = (negative_horizontal | ~(x_vertical | positive_horizontal)) & mask
+        negative_vertical = positive_horizontal & x_vertical & mask
+    return distance
+
+
+def _code_points(sentence: str, width: int, padding: int) -> np.ndarray:
+    """Unicode code points of a sentence, padded to 'width' with 'padding'."""
+    points = np.full(width, padding, dtype=np.int32)
+    points[:len(sentence)] = np.frombuffer(sentence.encode("utf-32-le"), dtype=np.int32)
+    return points
+
+
+def batch_edit_distance(pairs: List[Tuple[str, str]], batch_size: int = BATCH_SIZE) -> List[int]:
+    """
+    Levenshtein distances of many sentence pairs, computed together with NumPy.
+
+    Pairs are sorted by length and cut into blocks of 'batch_size', so each
+    block is padded to similar lengths. A block holds its strings as padded
+    code-point arrays and fills the DP table one row of s1 at a time for all
+    pairs at once. Deletions and substitutions come from the previous row
+    with whole-array operations; the chain of insertions along the row,
+    D[i][j] = min(t[j], D[i][j - 1] + 1), equals j + the running minimum of
+    t[k] - k, which np.minimum.accumulate computes without a Python loop.
+    Cells past a pair's own lengths never feed back into its prefix cells,
+    so each distance is read off at (len(s1), len(s2)) unaffected by padding.
+    The batched table does O(len(s1) * len(s2)) work per pair, while Myers'
+    kernel needs O(len(s2)) word operations for s1 up to 64 characters and
+    grows slowly after that, so pairs with a sentence longer than
+    BATCH_MAX_LENGTH are handed to char_level_edit_distance instead.
+    Returns exactly the same values as char_level_edit_distance.
+    """
+    distances = [0] * len(pairs)
+    order = []
+    for k, (s1, s2) in enumerate(pairs):
+        if max(len(s1), len(s2)) > BATCH_MAX_LENGTH:
+            distances[k] = char_level_edit_distance(s1, s2)
+        else:
+            order.append(k)
+    order.sort(key=lambda k: (len(pairs[k][0]), len(pairs[k][1])))
+    for start in range(0, len(order), batch_size):
+        block = order[start:start + batch_size]
+        lengths1 = np.array([len(pairs[k][0]) for k in block])
+        lengths2 = np.array([len(pairs[k][1]) for k in block])
+        width1, width2 = int(lengths1.max()), int(lengths2.max())
+        # Different paddings, so padded cells never count as matches
+        s1 = np.stack([_code_points(pairs[k][0], width1, -1) for k in block])
+        s2 = np.stack([_code_points(pairs[k][1], width2, -2) for k in block])
+        columns = np.arange(width2 + 1, dtype=np.int32)
+        row = np.broadcast_to(columns, (len(block), width2 + 1)).copy()  # Row 0: j insertions
+        results = np.where(lengths1 == 0, lengths2, 0)
+        for i in range(1, width1 + 1):
+            substitute = row[:, :-1] + (s1[:, i - 1:i] != s2)
+            candidates = np.empty_like(row)
+            candidates[:, 0] = i
+            candidates[:, 1:] = np.minimum(row[:, 1:] + 1, substitute)
+            row = np.minimum.accumulate(candidates - columns, axis=1) + columns
+            finished = lengths1 == i
+            results[finished] = row[finished, lengths2[finished]]
+        for k, distance in zip(block, results.tolist()):
+            distances[k] = distance
+    return distances
+
+class CostMatrix:
+    """
+    Sentence-pair edit distances for two documents, each computed at most once.
+
+    Entries are filled lazily on first use, or in bulk with precompute(),
+    which hands all missing pairs to batch_edit_distance when the default
+    distance function is used.
+    A* generates the same (idx1, idx2) cell from several parents and the
+    report asks for the aligned pairs again, so sharing one matrix makes the
+    alignment cost scale with the number of distinct pairs.
+    """
+    def __init__(self, doc1: List[str], doc2: List[str],
+                 distance_func: Callable[[str, str], int] = char_level_edit_distance):
+        self.doc1 = doc1
+        self.doc2 = doc2
+        self.distance_func = distance_func
+        self._distances: Dict[Tuple[int, int], int] = {}
+        self.lookups = 0  # Number of distance requests, cached or not
+
+    def distance(self, idx1: int, idx2: int) -> int:
+        """Edit distance between doc1[idx1] and doc2[idx2] (0-based indices)."""
+        self.lookups += 1
+        key = (idx1, idx2)
+        distance = self._distances.get(key)
+        if distance is None:
+            distance = self.distance_func(self.doc1[idx1], self.doc2[idx2])
+            self._distances[key] = distance
+        return distance
+
+    def precompute(self, keys: Optional[Iterable[Tuple[int, int]]] = None) -> None:
+        """Fills in the given (idx1, idx2) pairs up front, or every sentence pair."""
+        if keys is None:
+            keys = ((idx1, idx2) for idx1 in range(len(self.doc1)) for idx2 in range(len(self.doc2)))
+        missing = [key for key in keys if key not in self._distances]
+        if self.distance_func is char_level_edit_distance:
+            distances = batch_edit_distance([(self.doc1[idx1], self.doc2[idx2]) for idx1, idx2 in missing])
+        else:
+            distances = [self.distance_func(self.doc1[idx1], self.doc2[idx2]) for idx1, idx2 in missing]
+        self._distances.update(zip(missing, distances))
+
+    @property
+    def computed(self) -> int:
+        """Number of distinct sentence pairs whose distance has been computed."""
+        return len(self._distances)
+
+
+def get_transition_cost(state: Tuple[int, int, int], doc1: List[str], doc2: List[str],
+                        cost_matrix: Optional[CostMatrix] = None) -> int:
     """
     Calculates the cost g(n) for a single transition (move).
     
@@ -31,11 +234,15 @@ def get_transition_cost(state: Tuple[int, int, int], doc1: List[str], doc2: List
     - move 0: Align sentences
     - move 1: Insert sentence from doc2 (skip in doc1)
     - move 2: Delete sentence from doc1 (skip in doc2)
+
+    Alignment costs are read from 'cost_matrix' when one is given.
     """
     idx1, idx2, move = state
     cost = 0
 
     if move == 0:  # Alignment
+        if cost_matrix is not None:
+            return cost_matrix.distance(idx1 - 1, idx2 - 1)
         sentence1 = doc1[idx1 - 1]
         sentence2 = doc2[idx2 - 1]
         cost = char_level_edit_distance(sentence1, sentence2)
@@ -63,4 +270,50 @@ def heuristic_cost(current_state: Tuple[int, int, int], goal_state: Tuple[int, i
     
     # The heuristic is the difference in the number of remaining sentences,
     # as these must be inserted or deleted.
-    return abs(remaining_doc1 - remaining_doc2)
\ No newline at end of file
+    return abs(remaining_doc1 - remaining_doc2)
+
+
+class SuffixLengthHeuristic:
+    """
+    Admissible heuristic in characters, from suffix sums precomputed per document.
+
+    For the sentences still to be consumed, with total lengths L1 and L2:
+    - every aligned pair costs at least the difference of its lengths and an
+      inserted or deleted sentence costs its full length, so the remaining
+      cost is at least |L1 - L2|;
+    - at least k = |remaining_doc1 - remaining_doc2| sentences of the longer
+      side are inserted or deleted, so it is also at least k times that
+      side's shortest remaining sentence.
+    The larger of the two is returned. Both bounds are consistent, so A*
+    with a closed set stays optimal. Each call is a few list reads.
+    """
+    def __init__(self, doc1: List[str], doc2: List[str]):
+        self.suffix_lengths1 = self._suffix_sums(doc1)
+        self.suffix_lengths2 = self._suffix_sums(doc2)
+        self.suffix_min1 = self._suffix_mins(doc1)
+        self.suffix_min2 = self._suffix_mins(doc2)
+
+    @staticmethod
+    def _suffix_sums(doc: List[str]) -> List[int]:
+        sums = [0] * (len(doc) + 1)
+        for idx in range(len(doc) - 1, -1, -1):
+            sums[idx] = sums[idx + 1] + len(doc[idx])
+        return sums
+
+    @staticmethod
+    def _suffix_mins(doc: List[str]) -> List[int]:
+        mins = [0] * (len(doc) + 1)
+        for idx in range(len(doc) - 1, -1, -1):
+            mins[idx] = len(doc[idx]) if idx == len(doc) - 1 else min(len(doc[idx]), mins[idx + 1])
+        return mins
+
+    def __call__(self, current_state: Tuple[int, int, int], goal_state: Tuple[int, int, int]) -> int:
+        idx1, idx2, _ = current_state
+        goal_idx1, goal_idx2, _ = goal_state
+        length_bound = abs(self.suffix_lengths1[idx1] - self.suffix_lengths2[idx2])
+        surplus = (goal_idx1 - idx1) - (goal_idx2 - idx2)
+        if surplus > 0:
+            return max(length_bound, surplus * self.suffix_min1[idx1])
+        if surplus < 0:
+            return max(length_bound, -surplus * self.suffix_min2[idx2])
+        return length_bound
@@ -0,0 +1,99 @@
+from typing import Callable, List, Optional, Tuple
+from cost_functions import CostMatrix, char_level_edit_distance, get_transition_cost
+
+def _pair_cost_func(doc1: List[str], doc2: List[str], cost_matrix: Optional[CostMatrix]) -> Callable[[int, int], int]:
+    """Alignment cost of doc1[idx1] and doc2[idx2] (0-based), cached only if a matrix is given."""
+    if cost_matrix is not None:
+        return cost_matrix.distance
+    return lambda idx1, idx2: char_level_edit_distance(doc1[idx1], doc2[idx2])
+
+def _last_row(rows: List[int], cols: List[int], delete_costs: List[int], insert_costs: List[int],
+              pair_cost: Callable[[int, int], int]) -> List[int]:
+    """
+    Last row of the alignment DP between the sentences 'rows' of doc1 and
+    'cols' of doc2 (index lists, possibly reversed), keeping only two rows:
+    entry j is the cheapest alignment of all of 'rows' with cols[:j].
+    """
+    previous = [0] * (len(cols) + 1)
+    for j, idx2 in enumerate(cols, 1):
+        previous[j] = previous[j - 1] + insert_costs[idx2]
+    for idx1 in rows:
+        current = [previous[0] + delete_costs[idx1]] + [0] * len(cols)
+        for j, idx2 in enumerate(cols, 1):
+            current[j] = min(previous[j - 1] + pair_cost(idx1, idx2),  # Align
+                             previous[j] + delete_costs[idx1],          # Delete
+                             current[j - 1] + insert_costs[idx2])       # Insert
+        previous = current
+    return previous
+
+def hirschberg_alignment(doc1: List[str], doc2: List[str],
+                         cost_matrix: Optional[CostMatrix] = None) -> List[Tuple[int, int, int]]:
+    """
+    Exact optimal sentence alignment by dynamic programming in linear memory.
+
+    Uses the same costs as a_star (edit distance to align, sentence length to
+    insert or delete). Hirschberg's divide and conquer splits doc1 in half,
+    finds where the optimal path crosses that row from a forward and a
+    backward pass over two DP rows each, and recurses on both halves. That
+    takes O(n * m) cost evaluations and O(n + m) memory; a 'cost_matrix'
+    avoids recomputing distances at the price of caching every pair.
+
+    Returns the path in the format of a_star: states (idx1, idx2, move_type)
+    from (0, 0, -1) to (len(doc1), len(doc2), move), ready for
+    alignment.reconstruct_alignment.
+    """
+    pair_cost = _pair_cost_func(doc1, doc2, cost_matrix)
+    delete_costs = [len(sentence) for sentence in doc1]
+    insert_costs = [len(sentence) for sentence in doc2]
+    moves: List[int] = []
+
+    def align(start1: int, end1: int, start2: int, end2: int) -> None:
+        if start1 == end1:
+            moves.extend([1] * (end2 - start2))
+            return
+        if start2 == end2:
+            moves.extend([2] * (end1 - start1))
+            return
+        if end1 - start1 == 1:
+            # One sentence left in doc1: align it with the best doc2 sentence, or delete it
+            inserted = sum(insert_costs[start2:end2])
+            best_cost, best_idx2 = delete_costs[start1] + inserted, None
+            for idx2 in range(start2, end2):
+                cost = inserted - insert_costs[idx2] + pair_cost(start1, idx2)
+                if cost < best_cost:
+                    best_cost, best_idx2 = cost, idx2
+            if best_idx2 is None:
+                moves.append(2)
+                moves.extend([1] * (end2 - start2))
+            else:
+                moves.extend([1] * (best_idx2 - start2))
+                moves.append(0)
+                moves.extend([1] * (end2 - best_idx2 - 1))
+            return
+
+        mid1 = (start1 + end1) // 2
+        cols = list(range(start2, end2))
+        forward = _last_row(list(range(start1, mid1)), cols, delete_costs, insert_costs, pair_cost)
+        backward = _last_row(list(range(end1 - 1, mid1 - 1, -1)), cols[::-1], delete_costs, insert_costs, pair_cost)
+        # forward[k] + backward[len - k]: best path crossing row mid1 at column start2 + k
+        num_cols = end2 - start2
+        split = min(range(num_cols + 1), key=lambda k: forward[k] + backward[num_cols - k])
+        align(start1, mid1, start2, start2 + split)
+        align(mid1, end1, start2 + split, end2)
+
+    align(0, len(doc1), 0, len(doc2))
+
+    path = [(0, 0, -1)]
+    idx1 = idx2 = 0
+    for move in moves:
+        if move != 1:
+            idx1 += 1
+        if move != 2:
+            idx2 += 1
+        path.append((idx1, idx2, move))
+    return path
+
+def path_cost(path: List[Tuple[int, int, int]], doc1: List[str], doc2: List[str],
+              cost_matrix: Optional[CostMatrix] = None) -> int:
+    """Total transition cost of an alignment path, e.g. to compare a_star and Hirschberg."""
+    return sum(get_transition_cost(state, doc1, doc2, cost_matrix) for state in path[1:])
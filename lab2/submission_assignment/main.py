@@ -1,7 +1,10 @@
 import text_processor
 import a_star_search
 import alignment
-from cost_functions import char_level_edit_distance
+from hirschberg_alignment import hirschberg_alignment
+from banded_alignment import banded_alignment
+from cost_functions import CostMatrix
+from sentence_cache import SentenceCache
 
 # download("en_core_web_sm")
 
@@ -9,12 +12,21 @@ from cost_functions import char_level_edit_distance
 DOC1_PATH = "doc1.txt"
 DOC2_PATH = "doc2.txt"
 PLAGIARISM_THRESHOLD = 15  # Edit distance below which is considered potential plagiarism
+# "astar" searches the alignment graph; "hirschberg" runs an exact DP in linear memory,
+# which suits book-length documents; "banded" only evaluates sentence pairs near the diagonal,
+# which suits long near-parallel documents
+ALIGNMENT_METHOD = "astar"
+BAND_WIDTH = 8  # Initial band half-width in sentences for "banded"; widened automatically
+USE_SENTENCE_CACHE = True  # Reuse the sentences of unchanged documents from sentence_cache/
 
 def main():
     """Main function to run the plagiarism detection process."""
     print("--- 1. Processing Documents ---")
-    doc1_sentences = text_processor.process_text_file(DOC1_PATH)
-    doc2_sentences = text_processor.process_text_file(DOC2_PATH)
+    if USE_SENTENCE_CACHE:
+        doc1_sentences, doc2_sentences = SentenceCache().sentences_many([DOC1_PATH, DOC2_PATH])
+    else:
+        doc1_sentences = text_processor.process_text_file(DOC1_PATH)
+        doc2_sentences = text_processor.process_text_file(DOC2_PATH)
 
     if not doc1_sentences or not doc2_sentences:
         print("Error: One or both documents are empty or could not be read.")
@@ -23,18 +35,34 @@ def main():
     print(f"Document 1 has {len(doc1_sentences)} sentences.")
     print(f"Document 2 has {len(doc2_sentences)} sentences.\n")
 
-    # --- 2. Running A* Search ---
-    print("--- 2. Starting A* Search for Optimal Alignment ---")
-    start_state = (0, 0, -1)  # (idx_doc1, idx_doc2, move_type) - -1 for start
-    goal_state = (len(doc1_sentences), len(doc2_sentences), -1)
-    
-    path = a_star_search.a_star(start_state, goal_state, doc1_sentences, doc2_sentences)
+    # Shared by the search and the report, so each sentence pair is compared at most once
+    cost_matrix = CostMatrix(doc1_sentences, doc2_sentences)
+
+    if ALIGNMENT_METHOD == "hirschberg":
+        print("--- 2. Computing Optimal Alignment (Hirschberg DP) ---")
+        # No cost matrix here: caching every pair would cost O(n * m) memory again
+        path = hirschberg_alignment(doc1_sentences, doc2_sentences)
+    elif ALIGNMENT_METHOD == "banded":
+        print("--- 2. Computing Banded Alignment ---")
+        band_stats = {}
+        path = banded_alignment(doc1_sentences, doc2_sentences, cost_matrix, BAND_WIDTH, band_stats)
+        print(f"Band half-width {band_stats['width']} after {band_stats['passes']} pass(es).")
+    else:
+        # --- 2. Running A* Search ---
+        print("--- 2. Starting A* Search for Optimal Alignment ---")
+        start_state = (0, 0, -1)  # (idx_doc1, idx_doc2, move_type) - -1 for start
+        goal_state = (len(doc1_sentences), len(doc2_sentences), -1)
+        path = a_star_search.a_star(start_state, goal_state, doc1_sentences, doc2_sentences, cost_matrix)
     
     if not path:
         print("Could not find an alignment path.")
         return
         
-    print("Optimal path found.\n")
+    print("Optimal path found.")
+    if ALIGNMENT_METHOD != "hirschberg":
+        print(f"Distinct sentence pairs compared: {cost_matrix.computed} "
+              f"(of {len(doc1_sentences) * len(doc2_sentences)}, {cost_matrix.lookups} lookups)")
+    print()
 
     # --- 3. Analyzing Results ---
     print("--- 3. Plagiarism Analysis Report ---")
@@ -43,11 +71,12 @@ def main():
     print(f"{'Operation':<10} | {'Document 1 Sentence':<60} | {'Document 2 Sentence'}")
     print("-" * 120)
 
-    for sent1, sent2, op in aligned_pairs:
+    # path[0] is the start state, which has no aligned pair
+    for (idx1, idx2, _), (sent1, sent2, op) in zip(path[1:], aligned_pairs):
         print(f"{op:<10} | {sent1:<60} | {sent2}")
 
         if op == "ALIGN":
-            distance = char_level_edit_distance(sent1, sent2)
+            distance = cost_matrix.distance(idx1 - 1, idx2 - 1)
             if distance <= PLAGIARISM_THRESHOLD:
                 print(f"  -> \033[91mPOTENTIAL PLAGIARISM DETECTED!\033[0m (Edit Distance: {distance})\n")
             else:
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import struct
+from array import array
+from importlib import metadata
+from typing import Callable, List, Optional
+import numpy as np
+import text_processor
+
+# --- Configuration ---
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentence_cache")
+FORMAT_VERSION = 1
+
+_SENTENCES_MAGIC = b"SNTC"
+_FINGERPRINTS_MAGIC = b"SNFP"
+_SENTENCES_HEADER = struct.Struct("<4sHI")     # magic, format version, number of sentences
+_FINGERPRINTS_HEADER = struct.Struct("<4sII")  # magic, rows, values per row
+
+def settings_key() -> str:
+    """
+    Preprocessing settings that change the sentence lists. Part of every
+    cache key, so changing the segmenter or a spaCy upgrade starts afresh.
+    Reads the spaCy version from package metadata without importing spaCy.
+    """
+    try:
+        spacy_version = metadata.version("spacy")
+    except metadata.PackageNotFoundError:
+        spacy_version = "none"
+    model = text_processor.STATISTICAL_MODEL if text_processor.SEGMENTER == "statistical" else ""
+    return (f"v{FORMAT_VERSION}:{text_processor.SEGMENTER}:{model}:{','.join(text_processor.UNUSED_COMPONENTS)}:"
+            f"{text_processor.CHUNK_SIZE}:{text_processor.STREAMING_THRESHOLD}:spacy-{spacy_version}")
+
+def content_key(file_path: str) -> str:
+    """SHA-256 of the file's bytes and the preprocessing settings, read in 1 MB blocks."""
+    digest = hashlib.sha256(settings_key().encode("utf-8"))
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class SentenceCache:
+    """
+    On-disk cache of cleaned sentence lists, keyed by content_key.
+
+    A sentence file holds a small header, the UTF-8 byte length of every
+    sentence as uint32 and the concatenated sentence bytes. Per-sentence
+    fingerprints (e.g. MinHash signatures) are stored next to it as a uint32
+    matrix, keyed additionally by the fingerprint parameters. Files are
+    written to a temporary name and renamed, so a crash never leaves a
+    truncated entry behind.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._keys = {}  # (path, mtime, size) -> content key, so a file is hashed once per run
+
+    def key(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        if memo_key not in self._keys:
+            self._keys[memo_key] = content_key(file_path)
+        return self._keys[memo_key]
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    @staticmethod
+    def _write(file_path: str, data: bytes) -> None:
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, file_path)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Cached sentences for a content key, or None."""
+        file_path = self._path(key, ".sent")
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, "rb") as file:
+            data = file.read()
+        magic, version, count = _SENTENCES_HEADER.unpack_from(data)
+        if magic != _SENTENCES_MAGIC or version != FORMAT_VERSION:
+            return None
+        lengths = array("I")
+        offset = _SENTENCES_HEADER.size
+        lengths.frombytes(data[offset:offset + 4 * count])
+        offset += 4 * count
+        sentences = []
+        for length in lengths:
+            sentences.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        return sentences
+
+    def put(self, key: str, sentences: List[str]) -> None:
+        encoded = [sentence.encode("utf-8") for sentence in sentences]
+        lengths = array("I", [len(sentence) for sentence in encoded])
+        self._write(self._path(key, ".sent"),
+                    _SENTENCES_HEADER.pack(_SENTENCES_MAGIC, FORMAT_VERSION, len(encoded))
+                    + lengths.tobytes() + b"".join(encoded))
+
+    def get_fingerprints(self, key: str, fingerprint_key: str) -> Optional[List[np.ndarray]]:
+        """Cached per-sentence fingerprints, or None."""
+        file_path = self._path(key, f".{fingerprint_key}.fp")
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, "rb") as file:
+            data = file.read()
+        magic, rows, cols = _FINGERPRINTS_HEADER.unpack_from(data)
+        if magic != _FINGERPRINTS_MAGIC:
+            return None
+        matrix = np.frombuffer(data, dtype="<u4", count=rows * cols, offset=_FINGERPRINTS_HEADER.size)
+        return list(matrix.reshape(rows, cols).astype(np.uint32))
+
+    def put_fingerprints(self, key: str, fingerprint_key: str, fingerprints: List[np.ndarray]) -> None:
+        cols = len(fingerprints[0]) if fingerprints else 0
+        matrix = np.array(fingerprints, dtype="<u4").reshape(len(fingerprints), cols)
+        self._write(self._path(key, f".{fingerprint_key}.fp"),
+                    _FINGERPRINTS_HEADER.pack(_FINGERPRINTS_MAGIC, len(fingerprints), cols) + matrix.tobytes())
+
+    def sentences(self, file_path: str) -> List[str]:
+        """Cleaned sentences of a file, running text_processor only on a cache miss."""
+        return self.sentences_many([file_path])[0]
+
+    def sentences_many(self, file_paths: List[str]) -> List[List[str]]:
+        """
+        Cleaned sentences of many files. Only the files missing from the cache
+        are segmented: files above text_processor.STREAMING_THRESHOLD are
+        streamed one by one, the rest together in one batched run.
+        """
+        keys = [self.key(file_path) for file_path in file_paths]
+        results: List[Optional[List[str]]] = [self.get(key) for key in keys]
+        missing = [i for i, sentences in enumerate(results) if sentences is None]
+        self.hits += len(file_paths) - len(missing)
+        self.misses += len(missing)
+        large = [i for i in missing if os.path.getsize(file_paths[i]) > text_processor.STREAMING_THRESHOLD]
+        for i in large:
+            results[i] = text_processor.process_text_file(file_paths[i])
+        small = [i for i in missing if i not in large]
+        if small:
+            for i, sentences in zip(small, text_processor.process_text_files([file_paths[i] for i in small])):
+                results[i] = sentences
+        for i in missing:
+            self.put(keys[i], results[i])
+        return results
+
+    def fingerprints(self, file_path: str, sentences: List[str], fingerprint_key: str,
+                     fingerprint_func: Callable[[str], np.ndarray]) -> List[np.ndarray]:
+        """Per-sentence fingerprints of a file, computing and storing them on a cache miss."""
+        key = self.key(file_path)
+        fingerprints = self.get_fingerprints(key, fingerprint_key)
+        if fingerprints is None:
+            fingerprints = [fingerprint_func(sentence) for sentence in sentences]
+            self.put_fingerprints(key, fingerprint_key, fingerprints)
+        return fingerprints
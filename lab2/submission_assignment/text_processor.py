@@ -1,14 +1,40 @@
-import spacy
+import os
 import string
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
-# Load the spacy model once to improve performance
-try:
-    NLP = spacy.load("en_core_web_sm")
-except OSError:
-    print("Spacy model 'en_core_web_sm' not found.")
-    print("Please run: python -m spacy download en_core_web_sm")
-    exit()
+# --- Configuration ---
+# "rule": spaCy's rule-based sentencizer on a blank English pipeline; needs no model download.
+# "statistical": en_core_web_sm with only the components that set sentence boundaries.
+SEGMENTER = "rule"
+STATISTICAL_MODEL = "en_core_web_sm"
+# Components of en_core_web_sm that play no part in sentence segmentation
+UNUSED_COMPONENTS = ["tagger", "attribute_ruler", "lemmatizer", "ner"]
+BATCH_SIZE = 64     # Documents per nlp.pipe batch
+N_PROCESS = 1       # Worker processes for nlp.pipe; -1 uses every core
+CHUNK_SIZE = 100_000                 # Characters read and segmented at a time when streaming
+STREAMING_THRESHOLD = 10 * CHUNK_SIZE  # Files larger than this (in bytes) are streamed
+
+_NLP = None  # Loaded on first use, so importing this module stays cheap
+
+def get_nlp():
+    """
+    Returns the sentence segmentation pipeline, loading it on first use.
+    If the statistical model is not installed, falls back to the rule-based
+    sentencizer instead of stopping the program.
+    """
+    global _NLP
+    if _NLP is None:
+        import spacy
+        if SEGMENTER == "statistical":
+            try:
+                _NLP = spacy.load(STATISTICAL_MODEL, exclude=UNUSED_COMPONENTS)
+            except OSError:
+                print(f"Spacy model '{STATISTICAL_MODEL}' not found, using the rule-based sentencizer.")
+                print(f"For statistical segmentation run: python -m spacy download {STATISTICAL_MODEL}")
+        if _NLP is None:
+            _NLP = spacy.blank("en")
+            _NLP.add_pipe("sentencizer")
+    return _NLP
 
 def read_file(file_path: str) -> str:
     """Reads the content of a file and returns it as a string."""
@@ -18,9 +44,57 @@ def read_file(file_path: str) -> str:
 
 def extract_sentences(text: str) -> List[str]:
     """Extracts sentences from a given text using spaCy."""
-    doc = NLP(text.lower())
+    doc = get_nlp()(text.lower())
     return [sent.text.strip() for sent in doc.sents if sent.text.strip()]
 
+def extract_sentences_batch(texts: Iterable[str], batch_size: int = BATCH_SIZE,
+                            n_process: Optional[int] = None) -> List[List[str]]:
+    """
+    Extracts the sentences of many texts with nlp.pipe, which tokenizes them
+    in batches and can spread the batches over several processes.
+    """
+    nlp = get_nlp()
+    docs = nlp.pipe((text.lower() for text in texts), batch_size=batch_size,
+                    n_process=N_PROCESS if n_process is None else n_process)
+    return [[sent.text.strip() for sent in doc.sents if sent.text.strip()] for doc in docs]
+
+def iter_sentences(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Streams the sentences of a file without reading it whole.
+
+    The file is read 'chunk_size' characters at a time and each chunk is
+    segmented on its own. The last sentence of a chunk may continue in the
+    next one, so its text is carried over and segmented again together with
+    the next chunk; every other sentence is yielded right away. Memory stays
+    proportional to the chunk size, not the file size. A carried-over
+    sentence that grows past 4 chunks (text without any sentence boundary)
+    is yielded as it is, which also keeps every segmented text well below
+    spaCy's default max_length.
+    """
+    nlp = get_nlp()
+    carry = ""
+    with open(file_path, "r", encoding="utf-8") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            text = carry + chunk.lower()
+            if not chunk:  # End of file: the last sentence is complete
+                if text.strip():
+                    for sent in nlp(text).sents:
+                        if sent.text.strip():
+                            yield sent.text.strip()
+                return
+            if not text.strip():  # Blank lines or padding only: nothing to segment, keep reading
+                carry = ""
+                continue
+            sents = list(nlp(text).sents)
+            for sent in sents[:-1]:
+                if sent.text.strip():
+                    yield sent.text.strip()
+            carry = text[sents[-1].start_char:] if sents else text
+            if len(carry) > 4 * chunk_size:
+                yield carry.strip()
+                carry = ""
+
 def remove_punctuation(sentence: str) -> str:
     """Removes punctuation and newline characters from a sentence."""
     return sentence.translate(str.maketrans("", "", string.punctuation)).replace("\n", " ")
@@ -28,6 +102,11 @@ def remove_punctuation(sentence: str) -> str:
 def process_text_file(file_path: str) -> List[str]:
     """
     Reads a file, extracts sentences, and cleans them by removing punctuation.
+    Files above STREAMING_THRESHOLD are segmented chunk by chunk, which bounds
+    the raw text and spaCy Doc held at once; the returned list still holds
+    every sentence. The aligners need random access to all sentences, so
+    main uses this; callers that can consume sentences one at a time should
+    use process_text_stream for constant memory.
 
     Args:
         file_path (str): The path to the text file.
@@ -35,7 +114,41 @@ def process_text_file(file_path: str) -> List[str]:
     Returns:
         List[str]: A list of cleaned sentences.
     """
+    if os.path.getsize(file_path) > STREAMING_THRESHOLD:
+        return list(process_text_stream(file_path))
     content = read_file(file_path)
     sentences = extract_sentences(content)
     cleaned_sentences = [remove_punctuation(sentence) for sentence in sentences]
-    return cleaned_sentences
\ No newline at end of file
+    return cleaned_sentences
+
+def process_text_stream(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Streaming form of process_text_file for very large documents: yields
+    cleaned sentences one at a time while the file is read in chunks.
+
+    Args:
+        file_path (str): The path to the text file.
+        chunk_size (int): Characters read per chunk.
+
+    Yields:
+        str: The next cleaned sentence.
+    """
+    for sentence in iter_sentences(file_path, chunk_size):
+        yield remove_punctuation(sentence)
+
+def process_text_files(file_paths: List[str], batch_size: int = BATCH_SIZE,
+                       n_process: Optional[int] = None) -> List[List[str]]:
+    """
+    Batched form of process_text_file for many documents.
+
+    Args:
+        file_paths (List[str]): Paths of the text files.
+        batch_size (int): Documents per nlp.pipe batch.
+        n_process (Optional[int]): Worker processes; defaults to N_PROCESS.
+
+    Returns:
+        List[List[str]]: The cleaned sentences of each file, in the same order.
+    """
+    texts = (read_file(file_path) for file_path in file_paths)
+    return [[remove_punctuation(sentence) for sentence in sentences]
+            for sentences in extract_sentences_batch(texts, batch_size, n_process)]